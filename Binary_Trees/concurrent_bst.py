@@ -0,0 +1,293 @@
+"""
+Thread-Safe BST (Readers-Writer Lock)
+=====================================
+
+A `BST` shared between threads is not safe: an AVL rotation in `add` or
+`remove` relinks several nodes one after another, and a lookup running in
+between can follow a half-updated pointer and miss a key that is there.
+
+ConcurrentBST wraps a BST with a readers-writer lock:
+- any number of readers (in, find, min_key, rank, range, ...) run together;
+- a writer (add, remove, rebuild) waits until the readers leave and then has
+  the tree to itself;
+- waiting writers block new readers, so a steady stream of lookups cannot
+  starve the background inserter.
+
+Lazy scans (range, keys) are materialized while the read lock is held, since
+a generator that outlives the lock would see later writes half-applied.
+For readers that want to keep a consistent view for a long time, see
+persistent_bst.py (immutable snapshots instead of locks).
+
+Note: under CPython's GIL the threads take turns executing bytecode, so
+lookup throughput does not grow with the thread count; the lock is about
+correctness. benchmark() shows the numbers for the running interpreter.
+"""
+
+import random
+import threading
+import time
+
+from bst import BST
+
+
+class RWLock:
+    """Writer-preferring readers-writer lock."""
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    def acquire_read(self):
+        with self._cond:
+            while self._writer or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._cond:
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        with self._cond:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+
+    def release_write(self):
+        with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+    def read_locked(self):
+        return _Held(self.acquire_read, self.release_read)
+
+    def write_locked(self):
+        return _Held(self.acquire_write, self.release_write)
+
+
+class _Held:
+    __slots__ = ("_acquire", "_release")
+
+    def __init__(self, acquire, release):
+        self._acquire = acquire
+        self._release = release
+
+    def __enter__(self):
+        self._acquire()
+
+    def __exit__(self, *exc):
+        self._release()
+
+
+class ConcurrentBST:
+    """The owned-root BST API, safe to share between threads."""
+
+    def __init__(self, balanced=True, tree=None):
+        self._tree = tree if tree is not None else BST(balanced=balanced)
+        self._lock = RWLock()
+
+    # Writers
+    def add(self, key):
+        with self._lock.write_locked():
+            self._tree.add(key)
+
+    def remove(self, key):
+        with self._lock.write_locked():
+            self._tree.remove(key)
+
+    def rebuild(self):
+        with self._lock.write_locked():
+            self._tree.rebuild()
+
+    # Readers
+    def __contains__(self, key):
+        with self._lock.read_locked():
+            return key in self._tree
+
+    def find(self, key):
+        """
+        (key, value) for key, or None. Copied out under the read lock: the
+        live node may be rotated or unlinked as soon as the lock is released.
+        """
+        with self._lock.read_locked():
+            node = self._tree.find(key)
+            return None if node is None else (node.val, node.value)
+
+    def get(self, key, default=None):
+        with self._lock.read_locked():
+            return self._tree.get(key, default)
+
+    def __len__(self):
+        with self._lock.read_locked():
+            return len(self._tree)
+
+    def min_key(self):
+        with self._lock.read_locked():
+            return self._tree.min_key()
+
+    def max_key(self):
+        with self._lock.read_locked():
+            return self._tree.max_key()
+
+    def lca(self, n1, n2):
+        with self._lock.read_locked():
+            return self._tree.lca(n1, n2)
+
+    def rank(self, key):
+        with self._lock.read_locked():
+            return self._tree.rank(key)
+
+    def select(self, k):
+        with self._lock.read_locked():
+            return self._tree.select(k)
+
+    def tree_height(self):
+        with self._lock.read_locked():
+            return self._tree.tree_height()
+
+    def range(self, lo=None, hi=None, inclusive=(True, True), offset=0, limit=None):
+        """Keys between lo and hi as a list (collected under the read lock)."""
+        with self._lock.read_locked():
+            return list(self._tree.range(lo, hi, inclusive, offset, limit))
+
+    def keys(self, start=None, reverse=False):
+        with self._lock.read_locked():
+            return list(self._tree.keys(start, reverse))
+
+    def __iter__(self):
+        return iter(self.keys())
+
+
+def _check_invariants(node):
+    """(height, size) of a subtree, asserting the AVL and size fields."""
+    stack = [(node, False)]
+    results = {None: (-1, 0)}
+    while stack:
+        node, done = stack.pop()
+        if node is None:
+            continue
+        if not done:
+            stack.append((node, True))
+            stack.append((node.left, False))
+            stack.append((node.right, False))
+            continue
+        lh, ls = results[node.left]
+        rh, rs = results[node.right]
+        assert abs(lh - rh) <= 1, "AVL balance broken"
+        assert node.height == 1 + max(lh, rh), "stale height"
+        assert node.size == 1 + ls + rs, "stale size"
+        results[node] = (node.height, node.size)
+    return results[node] if node is not None else (-1, 0)
+
+
+def stress_test(readers=8, writers=2, ops=20_000, seed=0):
+    """
+    Hammer one ConcurrentBST from several threads and verify the result.
+
+    Each writer owns a disjoint key range and adds then removes keys in it;
+    readers keep checking that a fixed set of permanent keys is always
+    visible and that every range scan comes back sorted.
+    """
+    permanent = list(range(0, 10 * ops, 10))
+    tree = ConcurrentBST()
+    for key in permanent:
+        tree.add(key)
+    errors = []
+    stop = threading.Event()
+
+    def writer(w):
+        rng = random.Random(seed + w)
+        mine = []
+        for _ in range(ops):
+            if mine and rng.random() < 0.4:
+                tree.remove(mine.pop(rng.randrange(len(mine))))
+            else:
+                key = (w + 1) * 10 * ops + rng.randrange(ops) * 10 + 1 + w
+                tree.add(key)
+                mine.append(key)
+        for key in mine:
+            tree.remove(key)
+
+    def reader(r):
+        rng = random.Random(seed + 1000 + r)
+        while not stop.is_set():
+            key = rng.choice(permanent)
+            if key not in tree:
+                errors.append(f"permanent key {key} missing")
+            lo = rng.randrange(10 * ops * (writers + 1))
+            scan = tree.range(lo, lo + 5000)
+            if scan != sorted(scan):
+                errors.append("range scan out of order")
+
+    reader_threads = [threading.Thread(target=reader, args=(r,)) for r in range(readers)]
+    writer_threads = [threading.Thread(target=writer, args=(w,)) for w in range(writers)]
+    for t in reader_threads + writer_threads:
+        t.start()
+    for t in writer_threads:
+        t.join()
+    stop.set()
+    for t in reader_threads:
+        t.join()
+
+    if tree.keys() != permanent:
+        errors.append("final key set differs from the permanent keys")
+    _check_invariants(tree._tree.root)
+    return errors
+
+
+def benchmark(thread_counts=(1, 2, 4, 8), n=100_000, lookups=200_000, seed=0):
+    """Lookup throughput (lookups / s) with a background writer running."""
+    rng = random.Random(seed)
+    tree = ConcurrentBST(tree=BST.from_sorted(range(0, 2 * n, 2), balanced=True))
+    probes = [rng.randrange(2 * n) for _ in range(lookups)]
+    results = {}
+    for threads in thread_counts:
+        stop = threading.Event()
+
+        def background_writer():
+            key = 2 * n + 1
+            while not stop.is_set():
+                tree.add(key)
+                tree.remove(key)
+                time.sleep(0.0001)
+
+        def reader(chunk):
+            for key in chunk:
+                key in tree
+
+        chunks = [probes[i::threads] for i in range(threads)]
+        writer_thread = threading.Thread(target=background_writer)
+        workers = [threading.Thread(target=reader, args=(chunk,)) for chunk in chunks]
+        writer_thread.start()
+        start = time.perf_counter()
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        elapsed = time.perf_counter() - start
+        stop.set()
+        writer_thread.join()
+        results[threads] = lookups / elapsed
+    return results
+
+
+if __name__ == "__main__":
+    tree = ConcurrentBST()
+    for key in [20, 10, 30, 5, 15, 25, 35]:
+        tree.add(key)
+    print("Inorder:", list(tree))
+    print("15 in tree:", 15 in tree, "| LCA(5, 15):", tree.lca(5, 15))
+    print("find(25):", tree.find(25), "| find(26):", tree.find(26))
+    print("Range [10, 30]:", tree.range(10, 30))
+
+    errors = stress_test()
+    print("Stress test:", "passed" if not errors else errors[:5])
+
+    for threads, rate in benchmark().items():
+        print(f"{threads} reader thread(s): {rate:,.0f} lookups/s")
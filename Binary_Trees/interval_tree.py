@@ -0,0 +1,154 @@
+"""
+Interval Tree (Augmented BST)
+=============================
+
+"Which stored intervals overlap t, or [a, b]?" needs a full scan of a plain
+BST. An interval tree is the same BST keyed by interval start, with one
+extra field per node:
+
+    max_end = the largest interval end anywhere in this node's subtree
+
+While searching, a subtree whose max_end < a cannot contain an overlap and
+is skipped whole; the right subtree is skipped once node.start > b, since
+everything there starts even later.
+
+IntervalTree subclasses BST: nodes are IntervalNode (the node class hooks;
+CountedIntervalNode in multiset mode) keyed by the (start, end) tuple, and _update() recomputes max_end next to height
+and size, so every rotation, insert, delete, bulk load, delete_range and
+rebuild keeps the augmentation correct without extra code.
+
+Intervals are closed: [start, end].
+
+Time Complexity: O(log n) insert / delete / any_overlap (balanced),
+                 O(min(n, k log n)) to report all k overlaps, usually
+                 close to O(log n + k)
+Space Complexity: O(n)
+"""
+
+import random
+import time
+
+from bst import BST, MapNode
+
+
+class IntervalNode(MapNode):
+    __slots__ = ("max_end",)
+
+    def __init__(self, key, value=None):
+        super().__init__(key, value)
+        self.max_end = key[1]
+
+
+class CountedIntervalNode(IntervalNode):
+    __slots__ = ("count",)
+
+    def __init__(self, key, value=None):
+        super().__init__(key, value)
+        self.count = 1
+
+
+class IntervalTree(BST):
+    """A (by default AVL-balanced) BST of closed intervals."""
+
+    node_class = IntervalNode
+    map_node_class = IntervalNode
+    multiset_node_class = CountedIntervalNode
+    balanced_by_default = True
+
+    def _update(self, node):
+        super()._update(node)
+        max_end = node.val[1]
+        if node.left is not None and node.left.max_end > max_end:
+            max_end = node.left.max_end
+        if node.right is not None and node.right.max_end > max_end:
+            max_end = node.right.max_end
+        node.max_end = max_end
+
+    def _link_balanced(self, nodes):
+        root = super()._link_balanced(nodes)
+        if root is None:
+            return None
+        # Heights are set; refresh max_end level by level from the leaves up.
+        levels = [[] for _ in range(root.height + 1)]
+        for node in nodes:
+            levels[node.height].append(node)
+        for level in levels:
+            for node in level:
+                self._update(node)
+        return root
+
+    def add_interval(self, start, end, value=None):
+        if end < start:
+            raise ValueError("interval end must not be before its start")
+        self.root = self.insert(self.root, (start, end), value)
+
+    def remove_interval(self, start, end):
+        """Delete one copy of [start, end], raising KeyError if it is absent."""
+        self.remove((start, end))
+
+    def overlapping(self, lo, hi=None):
+        """
+        Lazily yield every (start, end) overlapping [lo, hi] (the point lo
+        when hi is None), in start order.
+        """
+        if hi is None:
+            hi = lo
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            # Go left while the left side can still hold an overlap.
+            while node is not None and node.max_end >= lo:
+                stack.append(node)
+                node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            start, end = node.val
+            if start > hi:
+                return  # this and everything after it starts too late
+            if end >= lo:
+                yield node.val
+            node = node.right
+
+    def any_overlap(self, lo, hi=None):
+        """One interval overlapping [lo, hi] (or the point lo), or None. O(height)."""
+        if hi is None:
+            hi = lo
+        node = self.root
+        while node is not None:
+            start, end = node.val
+            if start <= hi and end >= lo:
+                return node.val
+            if node.left is not None and node.left.max_end >= lo:
+                node = node.left
+            else:
+                node = node.right
+        return None
+
+
+if __name__ == "__main__":
+    meetings = IntervalTree()
+    for start, end in [(15, 20), (10, 30), (17, 19), (5, 20), (12, 15), (30, 40)]:
+        meetings.add_interval(start, end)
+    print("Intervals:", list(meetings))
+    print("Overlapping t=18:", list(meetings.overlapping(18)))
+    print("Overlapping [21, 31]:", list(meetings.overlapping(21, 31)))
+    print("Any overlap with [41, 50]:", meetings.any_overlap(41, 50))
+    meetings.remove_interval(10, 30)
+    print("After removing [10, 30], overlapping [21, 31]:", list(meetings.overlapping(21, 31)))
+
+    # Many short ranges: pruning by max_end vs scanning every interval.
+    rng = random.Random(0)
+    n = 100_000
+    spans = sorted((s, s + rng.randint(0, 50)) for s in (rng.randrange(10 * n) for _ in range(n)))
+    tree = IntervalTree.from_sorted(spans)  # balanced, like IntervalTree()
+    queries = [rng.randrange(10 * n) for _ in range(300)]
+    start = time.perf_counter()
+    found = sum(len(list(tree.overlapping(t))) for t in queries)
+    indexed = time.perf_counter() - start
+    start = time.perf_counter()
+    scanned = sum(1 for t in queries for s, e in spans if s <= t <= e)
+    scan = time.perf_counter() - start
+    assert found == scanned
+    print(f"{len(queries)} stabbing queries over {n} intervals ({found} hits): "
+          f"tree {indexed:.3f}s, full scan {scan:.2f}s")
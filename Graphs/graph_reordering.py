@@ -0,0 +1,222 @@
+"""
+Cache-Friendly Vertex Reordering
+================================
+
+`Graph.adj_list` keeps vertices in insertion order, so on a large graph a BFS
+jumps all over memory: vertex 7 may be next to vertex 900_000. Renumbering the
+frozen (CSR) form so that neighbours get nearby ids keeps each traversal step
+inside the same few cache lines.
+
+Orderings (each returns a list `order` where order[new_id] = old_id):
+- bfs_order:    breadth-first visit order, component by component
+- rcm_order:    Reverse Cuthill-McKee, BFS from a pseudo-peripheral vertex
+                with neighbours taken by increasing degree, then reversed
+- degree_order: hubs first (or last), groups vertices of similar degree
+
+Quality is measured with the bandwidth: max |new_id(u) - new_id(v)| over all
+edges. Each adjacency list keeps its original neighbour order, so a BFS or DFS
+of the relabeled graph visits the same vertices in the same order; only the
+integer ids change (FrozenGraph.vertices still maps ids back to names).
+
+Time Complexity: O(V + E) for BFS order, O(V log V + E log d) for RCM
+Space Complexity: O(V + E)
+"""
+
+import random
+import time
+from array import array
+from collections import deque
+
+from graph import Graph
+
+
+def bandwidth(frozen):
+    """Largest id distance between the two ends of any edge."""
+    best = 0
+    offsets, targets = frozen.offsets, frozen.targets
+    for u in range(len(frozen)):
+        for k in range(offsets[u], offsets[u + 1]):
+            gap = abs(u - targets[k])
+            if gap > best:
+                best = gap
+    return best
+
+
+def bfs_order(frozen):
+    visited = bytearray(len(frozen))
+    order = []
+    for root in range(len(frozen)):
+        if visited[root]:
+            continue
+        visited[root] = 1
+        head = len(order)
+        order.append(root)
+        while head < len(order):
+            u = order[head]
+            head += 1
+            for v in frozen.neighbors(u):
+                if not visited[v]:
+                    visited[v] = 1
+                    order.append(v)
+    return order
+
+
+def _bfs_levels(frozen, root, allowed):
+    """Return (last level, depth) of a BFS from root inside one component."""
+    seen = {root}
+    level = [root]
+    depth = 0
+    while True:
+        nxt = []
+        for u in level:
+            for v in frozen.neighbors(u):
+                if v not in seen and allowed[v]:
+                    seen.add(v)
+                    nxt.append(v)
+        if not nxt:
+            return level, depth
+        level = nxt
+        depth += 1
+
+
+def _pseudo_peripheral(frozen, root, allowed):
+    """George-Liu heuristic: walk to the far end of the component."""
+    last, depth = _bfs_levels(frozen, root, allowed)
+    while True:
+        candidate = min(last, key=frozen.degree)
+        new_last, new_depth = _bfs_levels(frozen, candidate, allowed)
+        if new_depth <= depth:
+            return root
+        root, last, depth = candidate, new_last, new_depth
+
+
+def rcm_order(frozen):
+    n = len(frozen)
+    unvisited = bytearray(b"\x01") * n
+    order = []
+    # Lowest-degree vertex of each component is the starting guess.
+    # On directed graphs the peripheral start may not reach root, hence
+    # the inner while.
+    for root in sorted(range(n), key=frozen.degree):
+        while unvisited[root]:
+            start = _pseudo_peripheral(frozen, root, unvisited)
+            unvisited[start] = 0
+            queue = deque([start])
+            while queue:
+                u = queue.popleft()
+                order.append(u)
+                fresh = []
+                for v in frozen.neighbors(u):
+                    if unvisited[v]:
+                        unvisited[v] = 0
+                        fresh.append(v)
+                fresh.sort(key=frozen.degree)
+                queue.extend(fresh)
+    order.reverse()
+    return order
+
+
+def degree_order(frozen, descending=True):
+    return sorted(range(len(frozen)), key=frozen.degree, reverse=descending)
+
+
+def relabel(frozen, order):
+    """Build a new FrozenGraph where vertex order[i] becomes id i."""
+    if len(order) != len(frozen):
+        raise ValueError("order must list every vertex exactly once.")
+    new_id = array("i", [-1]) * len(frozen)
+    for i, old in enumerate(order):
+        new_id[old] = i
+    if -1 in new_id:
+        raise ValueError("order must list every vertex exactly once.")
+
+    offsets = array("i", [0])
+    targets = array("i")
+    for old in order:
+        # Keep the neighbour order: traversals must not change visit order.
+        targets.extend(new_id[v] for v in frozen.neighbors(old))
+        offsets.append(len(targets))
+    vertices = [frozen.vertices[old] for old in order]
+    return type(frozen)(vertices, offsets, targets)
+
+
+ORDERINGS = {
+    "bfs": bfs_order,
+    "rcm": rcm_order,
+    "degree": degree_order,
+}
+
+
+def reorder(graph, method="rcm"):
+    """
+    Freeze (if needed) and renumber a graph.
+
+    Returns:
+        (relabeled FrozenGraph, report) where report holds the bandwidth
+        before and after and the time spent computing the order and
+        relabeling (the bandwidth scans are not included).
+    """
+    frozen = graph.freeze() if isinstance(graph, Graph) else graph
+    if method not in ORDERINGS:
+        raise ValueError(f"Unknown method {method!r}, use one of {sorted(ORDERINGS)}")
+    began = time.perf_counter()
+    result = relabel(frozen, ORDERINGS[method](frozen))
+    seconds = time.perf_counter() - began
+    report = {
+        "method": method,
+        "bandwidth_before": bandwidth(frozen),
+        "bandwidth_after": bandwidth(result),
+        "seconds": seconds,
+    }
+    return result, report
+
+
+def bfs_frozen(frozen, start_vertex):
+    """Same result as bfs_traversal, running on the CSR arrays."""
+    offsets, targets = frozen.offsets, frozen.targets
+    visited = bytearray(len(frozen))
+    start = frozen.index[start_vertex]
+    visited[start] = 1
+    order = [start]
+    head = 0
+    while head < len(order):
+        u = order[head]
+        head += 1
+        for k in range(offsets[u], offsets[u + 1]):
+            v = targets[k]
+            if not visited[v]:
+                visited[v] = 1
+                order.append(v)
+    return [frozen.vertices[i] for i in order]
+
+
+if __name__ == "__main__":
+    # A 2-D mesh whose vertices are added in random order.
+    side = 150
+    cells = [(r, c) for r in range(side) for c in range(side)]
+    random.seed(7)
+    random.shuffle(cells)
+    graph = Graph()
+    for r, c in cells:
+        graph.add_vertex((r, c))
+    for r, c in cells:
+        if r + 1 < side:
+            graph.add_edge((r, c), (r + 1, c))
+        if c + 1 < side:
+            graph.add_edge((r, c), (r, c + 1))
+
+    frozen = graph.freeze()
+    for method in ("bfs", "rcm", "degree"):
+        result, report = reorder(frozen, method)
+        print(f"{method:>6}: bandwidth {report['bandwidth_before']} -> "
+              f"{report['bandwidth_after']} ({report['seconds']:.3f}s)")
+
+    rcm, _ = reorder(frozen, "rcm")
+    for name, g in (("insertion order", frozen), ("rcm order", rcm)):
+        began = time.perf_counter()
+        visited = bfs_frozen(g, (0, 0))
+        print(f"BFS over {name}: {len(visited)} vertices "
+              f"in {time.perf_counter() - began:.3f}s")
+
+    # Relabeling never changes which vertices a traversal reaches, nor the order.
+    assert bfs_frozen(frozen, (0, 0)) == bfs_frozen(rcm, (0, 0))
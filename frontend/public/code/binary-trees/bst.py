@@ -1,54 +1,447 @@
+import math
+from array import array
+from heapq import merge as _merge_sorted
+from itertools import islice, repeat
+
+_MAGIC = b"BST\x01"  # format tag + version for to_bytes() / from_bytes()
+
+
+def _write_varints(values, out):
+    """Append unsigned ints to bytearray out, 7 bits per byte (LEB128)."""
+    append = out.append
+    for value in values:
+        while value > 0x7F:
+            append((value & 0x7F) | 0x80)
+            value >>= 7
+        append(value)
+
+
+def _read_varints(data, pos, count):
+    """
+    Decode count LEB128 ints from data[pos:]. Returns (values, new pos).
+    Raises ValueError if data ends before the last one.
+    """
+    end = len(data)
+    if end - pos < count:  # every value takes at least one byte
+        raise ValueError("truncated BST payload")
+    values = []
+    append = values.append
+    for _ in range(count):
+        if pos >= end:
+            raise ValueError("truncated BST payload")
+        byte = data[pos]
+        pos += 1
+        if byte < 0x80:
+            append(byte)
+            continue
+        value = byte & 0x7F
+        shift = 7
+        while True:
+            if pos >= end:
+                raise ValueError("truncated BST payload")
+            byte = data[pos]
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        append(value)
+    return values, pos
+
+
+def _morris_step(node):
+    """
+    One step of a Morris inorder walk from node: (node if it is visited now,
+    else None; the node to continue from). Adds or removes one thread.
+    """
+    if node.left is None:
+        return node, node.right
+    pred = node.left
+    while pred.right is not None and pred.right is not node:
+        pred = pred.right
+    if pred.right is None:
+        pred.right = node  # thread back to node
+        return None, node.left
+    pred.right = None  # second visit: left subtree done
+    return node, node.right
+
+
 class Node:
-    """A class to create a Node of BST."""
+    """
+    A class to create a Node of BST.
+
+    __slots__ drops the per-instance __dict__, roughly halving the memory
+    of every node (see bst_pool.py for a denser array-backed layout).
+    A plain node stores no payload and exactly one copy of its key; the
+    class attributes below answer for those, MapNode and CountedNode add
+    real slots only where a tree needs them.
+    """
+    __slots__ = ("left", "right", "val", "height", "size")
+    value = None
+    count = 1
+
     def __init__(self, key):
         self.left = None
         self.right = None
         self.val = key
+        self.height = 0
+        self.size = 1  # number of keys (copies included) in the subtree
+
+
+class MapNode(Node):
+    """Node with a payload, used for keys stored through put()."""
+    __slots__ = ("value",)
+
+    def __init__(self, key, value=None):
+        super().__init__(key)
+        self.value = value
+
+
+class CountedNode(MapNode):
+    """Node of a multiset tree: equal keys share it with a copy count."""
+    __slots__ = ("count",)
+
+    def __init__(self, key, value=None):
+        super().__init__(key, value)
+        self.count = 1
 
 
 class BST:
-    """A class for the Binary Search Tree."""
-    def __init__(self):
+    """
+    A class for the Binary Search Tree.
+
+    With balanced=True the tree is kept AVL-balanced: after every insert and
+    delete the nodes on the way back to the root are rotated so that the two
+    subtree heights never differ by more than one. The height then stays
+    below ~1.44 * log2(n), even for sorted input.
+
+    With multiset=True equal keys share one node with a copy count instead
+    of forming a chain of right children. len, rank, select and range count
+    every copy; plain traversals yield each key once unless expand=True.
+
+    Nodes come from three hooks: node_class for bare keys, map_node_class
+    for keys with a value and multiset_node_class (used for every node of a
+    multiset). Subclasses can store extra per-node data by pointing all
+    three at Node subclasses and extending _update (see interval_tree.py).
+    """
+    node_class = Node
+    map_node_class = MapNode
+    multiset_node_class = CountedNode
+    balanced_by_default = False  # what balanced=None means for this class
+
+    def __init__(self, balanced=None, multiset=False):
         self.root = None
+        self.balanced = self.balanced_by_default if balanced is None else balanced
+        self.multiset = multiset
+        self.version = 0  # bumped on every change; lets caches detect staleness
+
+    @classmethod
+    def from_sorted(cls, iterable, balanced=None, multiset=False):
+        """
+        Build a perfectly balanced tree from keys in non-decreasing order.
+
+        Every node is created once and linked by index arithmetic, so this
+        is O(n) instead of the O(n log n) (or O(n^2) for sorted input) of
+        repeated insert. The result is also a valid AVL tree.
+        """
+        keys = list(iterable)
+        for i in range(1, len(keys)):
+            if keys[i] < keys[i - 1]:
+                raise ValueError("from_sorted() needs keys in non-decreasing order")
+        tree = cls(balanced=balanced, multiset=multiset)
+        tree.root = tree._build_sorted(keys)
+        return tree
+
+    @classmethod
+    def from_iterable(cls, iterable, dedupe=False, balanced=None, multiset=False):
+        """Sort keys (optionally dropping duplicates) and bulk-load them."""
+        keys = sorted(iterable)
+        if dedupe:
+            keys = [key for i, key in enumerate(keys) if i == 0 or key != keys[i - 1]]
+        tree = cls(balanced=balanced, multiset=multiset)
+        tree.root = tree._build_sorted(keys)
+        return tree
+
+    def _key_class(self):
+        """Node class for a key without a value."""
+        return self.multiset_node_class if self.multiset else self.node_class
+
+    def _new_node(self, key, value=None):
+        if self.multiset:
+            return self.multiset_node_class(key, value)
+        if value is None:
+            return self.node_class(key)
+        return self.map_node_class(key, value)
+
+    def _build_sorted(self, keys):
+        """Link sorted keys into a balanced subtree (middle key at the top)."""
+        make = self._key_class()
+        if not self.multiset:
+            return self._link_balanced([make(key) for key in keys])
+        nodes = []
+        for key in keys:
+            if nodes and nodes[-1].val == key:
+                nodes[-1].count += 1
+            else:
+                nodes.append(make(key))
+        return self._link_balanced(nodes)
+
+    def _link_balanced(self, nodes):
+        """Relink nodes (already in sorted order) into a balanced subtree."""
+        if not nodes:
+            return None
+        # before[i] = copies held by nodes[:i] (just i without a multiset)
+        before = None
+        if self.multiset:
+            before = [0]
+            for node in nodes:
+                before.append(before[-1] + node.count)
+        stack = [(0, len(nodes) - 1)]
+        while stack:
+            lo, hi = stack.pop()
+            mid = (lo + hi) // 2
+            node = nodes[mid]
+            # A subtree of m keys split this way has height floor(log2(m)).
+            node.height = (hi - lo + 1).bit_length() - 1
+            node.size = hi - lo + 1 if before is None else before[hi + 1] - before[lo]
+            node.left = node.right = None
+            if lo < mid:
+                node.left = nodes[(lo + mid - 1) // 2]
+                stack.append((lo, mid - 1))
+            if mid < hi:
+                node.right = nodes[(mid + 1 + hi) // 2]
+                stack.append((mid + 1, hi))
+        return nodes[(len(nodes) - 1) // 2]
+
+    def _node_height(self, node):
+        return node.height if node else -1
+
+    def _node_size(self, node):
+        return node.size if node else 0
+
+    def _update(self, node):
+        """Recompute the metadata stored in node from its children."""
+        node.height = 1 + max(self._node_height(node.left), self._node_height(node.right))
+        node.size = node.count + self._node_size(node.left) + self._node_size(node.right)
+
+    def _rotate_left(self, node):
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rotate_right(self, node):
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rebalance(self, node):
+        """Restore the AVL property at node and return the new subtree root."""
+        self._update(node)
+        balance = self._node_height(node.left) - self._node_height(node.right)
+        if balance > 1:
+            if self._node_height(node.left.left) < self._node_height(node.left.right):
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        if balance < -1:
+            if self._node_height(node.right.right) < self._node_height(node.right.left):
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+        return node
+
+    def _fix_path(self, path, delta=None):
+        """
+        Walk a root-to-node path bottom-up after a change below it,
+        rebalancing (balanced mode) and re-linking rotated subtrees.
+        Returns the (possibly new) root.
+
+        delta is the change in key count below every node of path, when
+        known. An unbalanced tree without extra node data then just adds it
+        to each size and recomputes heights only while they still change.
+        """
+        if not self.balanced:
+            if delta is None or type(self)._update is not BST._update:
+                for node in reversed(path):
+                    self._update(node)
+                return path[0]
+            height_changed = True
+            for node in reversed(path):
+                node.size += delta
+                if height_changed:
+                    left, right = node.left, node.right
+                    lh = left.height if left is not None else -1
+                    rh = right.height if right is not None else -1
+                    height = 1 + (lh if lh > rh else rh)
+                    height_changed = height != node.height
+                    node.height = height
+            return path[0]
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            new = self._rebalance(node)
+            if new is not node and i > 0:
+                parent = path[i - 1]
+                if parent.left is node:
+                    parent.left = new
+                else:
+                    parent.right = new
+            path[i] = new
+        return path[0]
 
-    def insert(self, root, key):
-        """Insert a node into BST."""
+    def insert(self, root, key, value=None):
+        """Insert a node into BST (iterative, returns the new root)."""
+        self.version += 1
         if root is None:
-            return Node(key)
-        if key < root.val:
-            root.left = self.insert(root.left, key)
+            return self._new_node(key, value)
+        path = []
+        current = root
+        if self.multiset:
+            while current is not None:
+                path.append(current)
+                if key == current.val:
+                    current.count += 1  # repeat: no new node at all
+                    for ancestor in path:
+                        ancestor.size += 1
+                    return root
+                current = current.left if key < current.val else current.right
+        else:
+            while current is not None:
+                path.append(current)
+                current = current.left if key < current.val else current.right
+        node = self._new_node(key, value)
+        parent = path[-1]
+        if key < parent.val:
+            parent.left = node
         else:
-            root.right = self.insert(root.right, key)
-        return root
+            parent.right = node
+        return self._fix_path(path, 1)
 
     def inorder(self, root):
         """Inorder traversal (Left -> Root -> Right)."""
-        if root:
-            self.inorder(root.left)
-            print(root.val, end=" ")
-            self.inorder(root.right)
+        for key in self.iter_inorder(root):
+            print(key, end=" ")
 
     def preorder(self, root):
         """Preorder traversal (Root -> Left -> Right)."""
-        if root:
-            print(root.val, end=" ")
-            self.preorder(root.left)
-            self.preorder(root.right)
+        for key in self.iter_preorder(root):
+            print(key, end=" ")
 
     def postorder(self, root):
         """Postorder traversal (Left -> Right -> Root)."""
-        if root:
-            self.postorder(root.left)
-            self.postorder(root.right)
-            print(root.val, end=" ")
+        for key in self.iter_postorder(root):
+            print(key, end=" ")
+
+    def iter_inorder(self, root, start=None, reverse=False, expand=False):
+        """
+        Lazily yield keys in sorted order (descending with reverse=True).
+
+        With start given, the walk seeks straight to it and yields only
+        keys >= start (<= start when reversed). Only the path to the current
+        node is kept on the stack, so memory is O(height); stop whenever.
+        expand=True repeats each multiset key once per copy.
+        """
+        near, far = ("right", "left") if reverse else ("left", "right")
+        stack = []
+        node = root
+        while node is not None:
+            if start is None:
+                stack.append(node)
+                node = getattr(node, near)
+            elif (node.val <= start) if reverse else (node.val >= start):
+                stack.append(node)
+                node = getattr(node, near)
+            else:
+                node = getattr(node, far)
+        return self._resume_inorder(stack, near, far, expand)
+
+    def _resume_inorder(self, stack, near="left", far="right", expand=False):
+        """Continue an inorder walk whose pending ancestors are on stack."""
+        while stack:
+            node = stack.pop()
+            if expand:
+                yield from repeat(node.val, node.count)
+            else:
+                yield node.val
+            node = getattr(node, far)
+            while node is not None:
+                stack.append(node)
+                node = getattr(node, near)
+
+    def iter_morris(self, root):
+        """
+        Lazily yield keys in sorted order with O(1) extra memory.
+
+        Morris traversal: before descending into a left subtree, the right
+        pointer of that subtree's largest node (the inorder predecessor) is
+        pointed back at the current node, so the walk can climb back up
+        without a stack; the thread is removed on the second visit. Every
+        edge is followed at most twice, so a full walk is still O(n).
+
+        The tree is temporarily modified: don't change it, or read it from
+        another thread, while the iterator is alive. If the consumer stops
+        early, the remaining threads are unwound on close() (or when the
+        generator is garbage-collected), leaving the tree exactly as before.
+        """
+        node = root
+        try:
+            while node is not None:
+                visited, node = _morris_step(node)
+                if visited is not None:
+                    yield visited.val
+        finally:
+            # Stopped early: finish the walk without yielding to remove
+            # the threads still in place.
+            while node is not None:
+                node = _morris_step(node)[1]
+
+    def iter_preorder(self, root):
+        """Lazily yield keys in preorder."""
+        stack = [root] if root else []
+        while stack:
+            node = stack.pop()
+            yield node.val
+            if node.right:
+                stack.append(node.right)
+            if node.left:
+                stack.append(node.left)
+
+    def iter_postorder(self, root):
+        """Lazily yield keys in postorder."""
+        stack = []
+        last = None
+        node = root
+        while stack or node:
+            if node:
+                stack.append(node)
+                node = node.left
+                continue
+            top = stack[-1]
+            if top.right and last is not top.right:
+                node = top.right
+            else:
+                yield top.val
+                last = stack.pop()
+
+    def __iter__(self):
+        return self.iter_inorder(self.root)
+
+    def __reversed__(self):
+        return self.iter_inorder(self.root, reverse=True)
+
+    def keys(self, start=None, reverse=False, expand=False):
+        """Sorted keys of this tree, optionally from start onwards."""
+        return self.iter_inorder(self.root, start, reverse, expand)
 
     def search(self, root, key):
         """Search for a key in BST."""
-        if root is None or root.val == key:
-            return root
-        if key < root.val:
-            return self.search(root.left, key)
-        return self.search(root.right, key)
+        current = root
+        while current is not None and current.val != key:
+            current = current.left if key < current.val else current.right
+        return current
 
     def min_value_node(self, root):
         """Find the node with the smallest value in the BST."""
@@ -65,40 +458,690 @@ class BST:
         return current
 
     def delete_node(self, root, key):
-        """Delete a node from BST."""
-        if root is None:
+        """Delete a node from BST (iterative, returns the new root)."""
+        path = []
+        current = root
+        while current is not None and current.val != key:
+            path.append(current)
+            current = current.left if key < current.val else current.right
+        if current is None:
             return root
-        if key < root.val:
-            root.left = self.delete_node(root.left, key)
-        elif key > root.val:
-            root.right = self.delete_node(root.right, key)
+        self.version += 1
+
+        removed = current.count
+        if current.left is None or current.right is None:
+            replacement = current.left if current.left is not None else current.right
+            if not path:
+                return replacement
+            parent = path[-1]
+            if parent.left is current:
+                parent.left = replacement
+            else:
+                parent.right = replacement
+            return self._fix_path(path, -removed)
+
+        # Two children: unlink the inorder successor and move it into
+        # current's place (nodes are relinked, never copied into each other).
+        at = len(path)
+        path.append(current)
+        successor = current.right
+        while successor.left is not None:
+            path.append(successor)
+            successor = successor.left
+        if path[-1] is current:
+            current.right = successor.right
         else:
-            if root.left is None:
-                return root.right
-            elif root.right is None:
-                return root.left
-            temp = self.min_value_node(root.right)
-            root.val = temp.val
-            root.right = self.delete_node(root.right, temp.val)
-        return root
+            path[-1].left = successor.right
+        successor.left, successor.right = current.left, current.right
+        successor.height, successor.size = current.height, current.size
+        path[at] = successor
+        if at:
+            if path[at - 1].left is current:
+                path[at - 1].left = successor
+            else:
+                path[at - 1].right = successor
+        # Nodes under the successor's new spot lose its copies, not current's;
+        # pre-correct them so one delta fits the whole path.
+        if successor.count != removed:
+            for node in islice(path, at + 1, None):
+                node.size += removed - successor.count
+        return self._fix_path(path, -removed)
 
     def find_lca(self, root, n1, n2):
         """Find Lowest Common Ancestor (LCA) of two nodes."""
-        if root is None:
-            return None
-        if root.val > n1 and root.val > n2:
-            return self.find_lca(root.left, n1, n2)
-        elif root.val < n1 and root.val < n2:
-            return self.find_lca(root.right, n1, n2)
-        return root
+        current = root
+        while current is not None:
+            if current.val > n1 and current.val > n2:
+                current = current.left
+            elif current.val < n1 and current.val < n2:
+                current = current.right
+            else:
+                return current
+        return None
 
     def height(self, root):
-        """Find the height of the BST."""
-        if root is None:
-            return -1
-        left_height = self.height(root.left)
-        right_height = self.height(root.right)
-        return max(left_height, right_height) + 1
+        """Find the height of the BST (stored in the node, O(1))."""
+        return self._node_height(root)
+
+    # Owned-root API: the tree keeps its own root, no `root = ...` threading.
+
+    def add(self, key):
+        """Insert key into this tree."""
+        self.root = self.insert(self.root, key)
+
+    def remove(self, key):
+        """Delete one occurrence of key, raising KeyError if it is absent."""
+        self.remove_one(key)
+
+    def remove_one(self, key):
+        """
+        Drop one copy of key (KeyError if absent). In multiset mode the
+        count is decremented and the node unlinked only when it hits zero.
+        """
+        path = []
+        node = self.root
+        while node is not None and node.val != key:
+            path.append(node)
+            node = node.left if key < node.val else node.right
+        if node is None:
+            raise KeyError(key)
+        if node.count > 1:
+            node.count -= 1
+            node.size -= 1
+            for ancestor in path:
+                ancestor.size -= 1
+            self.version += 1
+            return
+        self.root = self.delete_node(self.root, key)
+
+    def count(self, key):
+        """Number of copies of key in the tree (O(height) in either mode)."""
+        return self._rank_le(key) - self.rank(key)
+
+    def find(self, key):
+        """Return the node holding key, or None."""
+        return self.search(self.root, key)
+
+    def __contains__(self, key):
+        return self.search(self.root, key) is not None
+
+    def min_key(self):
+        if self.root is None:
+            raise ValueError("min_key() of an empty BST")
+        return self.min_value_node(self.root).val
+
+    def max_key(self):
+        if self.root is None:
+            raise ValueError("max_key() of an empty BST")
+        return self.max_value_node(self.root).val
+
+    # Ordered map: put() keeps keys unique and stores a payload per key.
+
+    def put(self, key, value):
+        """Set the value for key, inserting the key if it is new."""
+        parent = None
+        node = self.root
+        while node is not None and node.val != key:
+            parent = node
+            node = node.left if key < node.val else node.right
+        if node is None:
+            self.root = self.insert(self.root, key, value)
+            return
+        self.version += 1
+        if isinstance(node, MapNode):
+            node.value = value
+            return
+        # A bare key has no value slot: swap a map node into its place.
+        mapped = self.map_node_class(key, value)
+        mapped.left, mapped.right = node.left, node.right
+        self._update(mapped)
+        if parent is None:
+            self.root = mapped
+        elif parent.left is node:
+            parent.left = mapped
+        else:
+            parent.right = mapped
+
+    def get(self, key, default=None):
+        node = self.search(self.root, key)
+        return default if node is None else node.value
+
+    def pop(self, key, *default):
+        """Remove key and return its value (or default; KeyError without one)."""
+        node = self.search(self.root, key)
+        if node is None:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        value = node.value
+        self.root = self.delete_node(self.root, key)
+        return value
+
+    def items(self, start=None, reverse=False):
+        """Lazily yield (key, value) pairs in key order."""
+        near, far = ("right", "left") if reverse else ("left", "right")
+        stack = []
+        node = self.root
+        while node is not None:
+            if start is None or ((node.val <= start) if reverse else (node.val >= start)):
+                stack.append(node)
+                node = getattr(node, near)
+            else:
+                node = getattr(node, far)
+        while stack:
+            node = stack.pop()
+            yield node.val, node.value
+            node = getattr(node, far)
+            while node is not None:
+                stack.append(node)
+                node = getattr(node, near)
+
+    def floor(self, key):
+        """Largest key <= key, or None."""
+        best = None
+        node = self.root
+        while node is not None:
+            if node.val == key:
+                return node.val
+            if node.val < key:
+                best = node.val
+                node = node.right
+            else:
+                node = node.left
+        return best
+
+    def ceiling(self, key):
+        """Smallest key >= key, or None."""
+        best = None
+        node = self.root
+        while node is not None:
+            if node.val == key:
+                return node.val
+            if node.val > key:
+                best = node.val
+                node = node.left
+            else:
+                node = node.right
+        return best
+
+    def predecessor(self, key):
+        """Largest key < key, or None."""
+        best = None
+        node = self.root
+        while node is not None:
+            if node.val < key:
+                best = node.val
+                node = node.right
+            else:
+                node = node.left
+        return best
+
+    def successor(self, key):
+        """Smallest key > key, or None."""
+        best = None
+        node = self.root
+        while node is not None:
+            if node.val > key:
+                best = node.val
+                node = node.left
+            else:
+                node = node.right
+        return best
+
+    def lca(self, n1, n2):
+        """LCA key of n1 and n2 in this tree, or None if the tree is empty."""
+        node = self.find_lca(self.root, n1, n2)
+        return node.val if node else None
+
+    def tree_height(self):
+        return self.height(self.root)
+
+    def degeneration(self):
+        """
+        (height + 1) / log2(n + 1): 1.0 for a perfectly balanced tree,
+        growing towards n / log2(n) as the tree turns into a linked list.
+        O(1), so it can be checked after every batch of updates.
+        """
+        n = len(self)
+        if n == 0:
+            return 1.0
+        return (self.tree_height() + 1) / math.log2(n + 1)
+
+    def _inorder_nodes(self):
+        nodes = []
+        stack = []
+        node = self.root
+        while stack or node:
+            if node:
+                stack.append(node)
+                node = node.left
+            else:
+                node = stack.pop()
+                nodes.append(node)
+                node = node.right
+        return nodes
+
+    def rebuild(self):
+        """Relink all nodes into a perfectly balanced shape in O(n)."""
+        self.root = self._link_balanced(self._inorder_nodes())
+        self.version += 1
+
+    # Bulk updates: cut or merge many keys at once instead of one descent each.
+
+    def _join(self, left, node, right):
+        """
+        Link left + node + right (all keys of left <= node <= right) into
+        one subtree. Balanced mode walks down the spine of the taller side
+        to a subtree about as tall as the shorter one, hangs node there and
+        rebalances on the way back: O(height difference).
+        """
+        if not self.balanced or abs(self._node_height(left) - self._node_height(right)) <= 1:
+            node.left, node.right = left, right
+            self._update(node)
+            return node
+        taller_left = self._node_height(left) > self._node_height(right)
+        short = right if taller_left else left
+        limit = self._node_height(short) + 1
+        path = []
+        spot = left if taller_left else right
+        while self._node_height(spot) > limit:
+            path.append(spot)
+            spot = spot.right if taller_left else spot.left
+        if taller_left:
+            node.left, node.right = spot, short
+            path[-1].right = self._rebalance(node)
+        else:
+            node.left, node.right = short, spot
+            path[-1].left = self._rebalance(node)
+        return self._fix_path(path)
+
+    def _join_two(self, left, right):
+        """Link two subtrees (all of left <= all of right) without a middle key."""
+        if left is None:
+            return right
+        if right is None:
+            return left
+        # Unlink the smallest node of right and use it as the middle key.
+        path = []
+        node = right
+        while node.left is not None:
+            path.append(node)
+            node = node.left
+        if path:
+            path[-1].left = node.right
+            right = self._fix_path(path)
+        else:
+            right = node.right
+        return self._join(left, node, right)
+
+    def _split(self, root, key, inclusive=False):
+        """
+        Cut a subtree into (keys < key, keys >= key), or (<= key, > key) with
+        inclusive=True, reusing its nodes. The pieces hanging off the search
+        path are joined bottom-up: O(height).
+        """
+        path = []
+        node = root
+        while node is not None:
+            goes_left = node.val <= key if inclusive else node.val < key
+            path.append((node, goes_left))
+            node = node.right if goes_left else node.left
+        left = right = None
+        for node, goes_left in reversed(path):
+            if goes_left:
+                left = self._join(node.left, node, left)
+            else:
+                right = self._join(right, node, node.right)
+        return left, right
+
+    def delete_range(self, lo, hi):
+        """
+        Delete every key with lo <= key <= hi and return how many went.
+
+        Two splits cut the window out as one detached subtree, which is
+        dropped whole; the outer parts are joined back: O(height), however
+        many keys are removed (their memory is then freed by refcounting).
+        """
+        if hi < lo or self.count_range(lo, hi) == 0:
+            return 0  # nothing to cut: leave the shape (and caches) alone
+        below, rest = self._split(self.root, lo)
+        window, above = self._split(rest, hi, inclusive=True)
+        self.root = self._join_two(below, above)
+        self.version += 1  # nodes were relinked
+        return self._node_size(window)
+
+    def add_sorted(self, iterable):
+        """
+        Insert a batch of keys given in non-decreasing order.
+
+        A batch that is large next to the tree is merged with the existing
+        nodes in one linear pass and relinked balanced, O(n + m); a small
+        one is inserted key by key, O(m log n), whichever is cheaper.
+        """
+        keys = list(iterable)
+        for i in range(1, len(keys)):
+            if keys[i] < keys[i - 1]:
+                raise ValueError("add_sorted() needs keys in non-decreasing order")
+        n = len(self)
+        if len(keys) * max(1, n.bit_length()) < n:
+            for key in keys:
+                self.add(key)
+            return
+        nodes = self._inorder_nodes()
+        make = self._key_class()
+        merged = []
+        i = 0
+        for key in keys:
+            while i < len(nodes) and nodes[i].val <= key:
+                merged.append(nodes[i])
+                i += 1
+            if self.multiset and merged and merged[-1].val == key:
+                merged[-1].count += 1
+            else:
+                merged.append(make(key))
+        merged.extend(nodes[i:])
+        self.root = self._link_balanced(merged)
+        self.version += 1
+
+    # Order statistics, O(height) each thanks to the subtree sizes.
+
+    def __len__(self):
+        return self._node_size(self.root)
+
+    def rank(self, key):
+        """Number of keys strictly smaller than key."""
+        count = 0
+        node = self.root
+        while node is not None:
+            if node.val < key:
+                count += self._node_size(node.left) + node.count
+                node = node.right
+            else:
+                node = node.left
+        return count
+
+    def _rank_le(self, key):
+        """Number of keys smaller than or equal to key."""
+        count = 0
+        node = self.root
+        while node is not None:
+            if node.val <= key:
+                count += self._node_size(node.left) + node.count
+                node = node.right
+            else:
+                node = node.left
+        return count
+
+    def select(self, k):
+        """The k-th smallest key, counting from 0."""
+        if not 0 <= k < len(self):
+            raise IndexError("select() index out of range")
+        node = self.root
+        while True:
+            left_size = self._node_size(node.left)
+            if k < left_size:
+                node = node.left
+            elif k < left_size + node.count:
+                return node.val
+            else:
+                k -= left_size + node.count
+                node = node.right
+
+    def _stack_at_index(self, k):
+        """
+        Inorder stack positioned at the node holding the k-th smallest key
+        (0-based), plus how many of that node's copies come before it.
+        """
+        stack = []
+        node = self.root
+        while node is not None:
+            left_size = self._node_size(node.left)
+            if k < left_size:
+                stack.append(node)
+                node = node.left
+            elif k < left_size + node.count:
+                stack.append(node)
+                return stack, k - left_size
+            else:
+                k -= left_size + node.count
+                node = node.right
+        return stack, 0
+
+    def kth_smallest(self, k):
+        """The k-th smallest key, counting from 1."""
+        return self.select(k - 1)
+
+    def count_range(self, lo, hi):
+        """Number of keys with lo <= key <= hi."""
+        if hi < lo:
+            return 0
+        return self._rank_le(hi) - self.rank(lo)
+
+    def range(self, lo=None, hi=None, inclusive=(True, True), offset=0, limit=None):
+        """
+        Lazily yield the keys between lo and hi in sorted order.
+
+        Args:
+            lo, hi: bounds; None leaves that side open
+            inclusive: (include lo, include hi), or one bool for both
+            offset: skip this many matching keys first
+            limit: stop after this many keys
+
+        The start is located by rank (subtree sizes), so subtrees left of
+        the window and the skipped offset are never visited, and the walk
+        stops at the first key past hi: O(height + output). In multiset
+        mode every copy is yielded, matching len() and rank().
+        """
+        if isinstance(inclusive, bool):
+            inclusive = (inclusive, inclusive)
+        lo_inclusive, hi_inclusive = inclusive
+        if lo is None:
+            first = 0
+        else:
+            first = self.rank(lo) if lo_inclusive else self._rank_le(lo)
+        first += offset
+        if first >= len(self) or limit == 0:
+            return
+        stack, skip = self._stack_at_index(first)
+        keys = self._resume_inorder(stack, expand=self.multiset)
+        if skip:
+            keys = islice(keys, skip, None)
+        produced = 0
+        for key in keys:
+            if hi is not None and (key > hi if hi_inclusive else key >= hi):
+                return
+            yield key
+            produced += 1
+            if produced == limit:
+                return
+
+    def percentile(self, p):
+        """Nearest-rank percentile: smallest key with at least p% of keys <= it."""
+        if not 0 <= p <= 100:
+            raise ValueError("percentile must be between 0 and 100")
+        n = len(self)
+        if n == 0:
+            raise ValueError("percentile() of an empty BST")
+        k = max(1, -(-p * n // 100))  # ceil(p * n / 100), at least 1
+        return self.select(int(k) - 1)
+
+    # Serialization: the preorder sequence of distinct keys fixes a BST's shape.
+
+    def to_bytes(self):
+        """
+        Encode the tree as its preorder key sequence (keys only, no values).
+
+        Layout: magic, flags, key kind, varint count, then the keys. Int keys
+        are stored as zigzag varint deltas from the previous key (1-3 bytes
+        for typical keys instead of a ~60-byte pickled node); float keys as
+        raw 8-byte doubles. Keys must be all ints or all floats.
+
+        Rotations can move a duplicate key into a left subtree, where the
+        preorder no longer says which side it was on; trees with duplicates
+        (or multiset copies) are therefore stored in sorted order and loaded
+        perfectly balanced.
+        """
+        keys = list(self.iter_inorder(self.root, expand=True))
+        distinct = all(keys[i] != keys[i - 1] for i in range(1, len(keys)))
+        if distinct:
+            keys = list(self.iter_preorder(self.root))
+        if all(type(key) is int for key in keys):
+            kind = b"i"
+        elif all(type(key) is float for key in keys):
+            kind = b"d"
+        else:
+            # Mixed int/float keys would come back as floats (and big ints
+            # rounded), so refuse rather than change the data.
+            raise TypeError("to_bytes() needs all-int or all-float keys")
+        out = bytearray(_MAGIC)
+        flags = (1 if self.balanced else 0) | (0 if distinct else 2) | (4 if self.multiset else 0)
+        out.append(flags)
+        out += kind
+        _write_varints((len(keys),), out)
+        if kind == b"i":
+            previous = 0
+            zigzag = []
+            for key in keys:
+                delta = key - previous
+                zigzag.append(delta << 1 if delta >= 0 else ((-delta) << 1) - 1)
+                previous = key
+            _write_varints(zigzag, out)
+        else:
+            out += array("d", keys).tobytes()
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data, balanced=None):
+        """
+        Rebuild a tree saved by to_bytes() in O(n), without per-key inserts.
+
+        Each preorder key becomes the left child of the top of a stack of
+        open ancestors, or the right child of the last ancestor popped for
+        being smaller than it. Heights and sizes are then filled in reverse
+        preorder (children before parents). balanced overrides the stored
+        flag; a tree saved unbalanced but loaded balanced is rebuilt into
+        AVL shape. A foreign, truncated or over-long payload raises
+        ValueError.
+        """
+        data = memoryview(data)
+        if bytes(data[:len(_MAGIC)]) != _MAGIC:
+            raise ValueError("not a BST.to_bytes() payload")
+        pos = len(_MAGIC)
+        if len(data) < pos + 3:  # flags, key kind, at least one count byte
+            raise ValueError("truncated BST payload")
+        flags = data[pos]
+        if balanced is None:
+            balanced = bool(flags & 1)
+        kind = bytes(data[pos + 1:pos + 2])
+        (count,), pos = _read_varints(data, pos + 2, 1)
+        if kind == b"i":
+            zigzag, pos = _read_varints(data, pos, count)
+            keys = []
+            previous = 0
+            for z in zigzag:
+                previous += (z >> 1) if not z & 1 else -((z + 1) >> 1)
+                keys.append(previous)
+        elif kind == b"d":
+            keys = array("d")
+            keys.frombytes(data[pos:pos + 8 * count])
+            pos += 8 * count
+        else:
+            raise ValueError(f"unknown key kind {kind!r}")
+        if pos != len(data) or len(keys) != count:
+            raise ValueError("truncated or trailing data in BST payload")
+
+        tree = cls(balanced=balanced, multiset=bool(flags & 4))
+        if flags & 2:  # sorted layout
+            tree.root = tree._build_sorted(keys)
+            return tree
+        make = tree._key_class()
+        nodes = [make(key) for key in keys]
+        stack = nodes[:1]
+        for node in islice(nodes, 1, None):
+            key = node.val
+            if key < stack[-1].val:
+                stack[-1].left = node
+            else:
+                parent = stack.pop()
+                while stack and stack[-1].val < key:
+                    parent = stack.pop()
+                parent.right = node
+            stack.append(node)
+
+        avl = True
+        for node in reversed(nodes):
+            tree._update(node)
+            if abs(tree._node_height(node.left) - tree._node_height(node.right)) > 1:
+                avl = False
+        tree.root = nodes[0] if nodes else None
+        if balanced and not avl:
+            tree.rebuild()
+        return tree
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path, balanced=None):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read(), balanced)
+
+
+def _copied_nodes(nodes, into):
+    """
+    Fresh copies of nodes (in sorted order) for the tree into, carrying
+    their values and counts; equal keys are folded together for a multiset.
+    """
+    copies = []
+    for node in nodes:
+        if into.multiset and copies and copies[-1].val == node.val:
+            copies[-1].count += node.count
+            continue
+        copy = into._new_node(node.val, node.value)
+        if into.multiset:
+            copy.count = node.count
+        copies.append(copy)
+    return copies
+
+
+def merge(a, b):
+    """
+    A new balanced tree holding the entries of both a and b (duplicates kept).
+
+    Both inputs are walked in order and merged in one pass, then linked
+    with the O(n) sorted build: O(n + m) overall, instead of O(m log(n + m))
+    for inserting b's keys into a one by one. Values (ordered-map mode) and
+    copy counts come along, and the result has a's type, so subclasses such
+    as IntervalTree keep their node augmentation. The inputs are unchanged.
+    """
+    tree = type(a)(balanced=a.balanced or b.balanced, multiset=a.multiset or b.multiset)
+    nodes = _merge_sorted(a._inorder_nodes(), b._inorder_nodes(), key=lambda node: node.val)
+    tree.root = tree._link_balanced(_copied_nodes(nodes, tree))
+    return tree
+
+
+def split(tree, key, copy=True):
+    """
+    Two trees of tree's type: keys < key and keys >= key, with values and
+    counts.
+
+    With copy=False the nodes of tree itself are cut along the search path
+    for key and joined into the two halves in O(height); tree is left empty.
+    That is the fast path for rebalancing shards. The default copy=True
+    leaves tree unchanged, but copying its nodes first costs O(n).
+    """
+    left = type(tree)(balanced=tree.balanced, multiset=tree.multiset)
+    right = type(tree)(balanced=tree.balanced, multiset=tree.multiset)
+    if copy:
+        source = type(tree)(balanced=tree.balanced, multiset=tree.multiset)
+        source.root = source._link_balanced(_copied_nodes(tree._inorder_nodes(), source))
+    else:
+        source = tree
+    left.root, right.root = source._split(source.root, key)
+    source.root = None
+    source.version += 1
+    return left, right
 
 # Driver code to test the BST implementation
 if __name__ == "__main__":
@@ -137,4 +1180,99 @@ if __name__ == "__main__":
     print("\nDeleting node 10 from BST")
     root = bst.delete_node(root, 10)
     print("Inorder Traversal after deletion:")
-    bst.inorder(root)
\ No newline at end of file
+    bst.inorder(root)
+
+    # Sorted keys (e.g. timestamps) turn a plain BST into a linked list;
+    # the balanced mode keeps the height logarithmic. Timings at scale live
+    # in bst_benchmark.py; the demos below stay small.
+    n = 1_000
+    avl = BST(balanced=True)
+    root = None
+    for key in range(n):
+        root = avl.insert(root, key)
+    print(f"\n\nHeight after {n} sorted inserts (balanced): {avl.height(root)}")
+
+    # The owned-root API keeps the root inside the tree; every operation is
+    # iterative, so a fully degenerate tree needs no recursion-limit change.
+    depth = 2_000  # well past the default recursion limit of 1000
+    chain = BST()
+    for key in range(depth):
+        chain.add(key)
+    chain.remove(depth // 2)
+    print(f"Degenerate tree: height {chain.tree_height()}, "
+          f"{depth - 1} in tree: {depth - 1 in chain}, LCA(10, 20): {chain.lca(10, 20)}")
+
+    # Traversals are generators: consume, seek and stop early.
+    print("First 5 keys from 1990:", list(islice(chain.keys(start=1990), 5)))
+    print("Largest 3 keys:", list(islice(reversed(chain), 3)))
+    print("Sum of all keys:", sum(chain))
+
+    # Heights are stored in the nodes, so monitoring degeneration is O(1).
+    print(f"Degeneration of the chain: {chain.degeneration():.1f}")
+    chain.rebuild()
+    print(f"After rebuild(): height {chain.tree_height()}, "
+          f"degeneration {chain.degeneration():.2f}")
+
+    # Subtree sizes answer order-statistic queries without a full walk.
+    print(f"Keys: {len(chain)}, 10th smallest: {chain.kth_smallest(10)}, "
+          f"rank(1500): {chain.rank(1500)}, in [100, 199]: {chain.count_range(100, 199)}, "
+          f"median: {chain.percentile(50)}")
+
+    # Range scans jump to the window start and stop at its end.
+    print("Keys in [1000, 1010):", list(chain.range(1000, 1010, inclusive=(True, False))))
+    print("Page 2 (size 5) of keys >= 1900:", list(chain.range(1900, offset=5, limit=5)))
+
+    # Bulk loading links nodes directly instead of n separate inserts.
+    bulk = BST.from_sorted(range(n), balanced=True)
+    print(f"from_sorted({n} keys): height {bulk.tree_height()}")
+    print("from_iterable with dedupe:", list(BST.from_iterable([3, 1, 3, 2, 1], dedupe=True)))
+
+    # Compact preorder encoding: restarts reload the index in O(n).
+    payload = bulk.to_bytes()
+    restored = BST.from_bytes(payload)
+    print(f"to_bytes: {len(payload)} bytes for {n} keys, "
+          f"from_bytes gives the same tree: {list(restored) == list(bulk)}")
+
+    # Shards combine and divide in linear time.
+    evens = BST.from_sorted(range(0, 20, 2))
+    odds = BST.from_sorted(range(1, 20, 2))
+    combined = merge(evens, odds)
+    print("merge:", list(combined), "height", combined.tree_height())
+    low, high = split(combined, 12, copy=False)  # O(height); combined is consumed
+    print("split at 12:", list(low), list(high))
+
+    # Ordered-map mode: payloads live in the nodes, no side dict needed.
+    prices = BST(balanced=True)
+    for ts, price in [(100, 9.5), (105, 9.7), (110, 9.6), (120, 9.9)]:
+        prices.put(ts, price)
+    prices.put(105, 9.8)
+    print("get(105):", prices.get(105), "| floor(117):", prices.floor(117),
+          "| ceiling(111):", prices.ceiling(111), "| successor(120):", prices.successor(120))
+    print("pop(100):", prices.pop(100), "| items:", list(prices.items()))
+
+    # Multiset mode: one node per distinct key, however many repeats arrive.
+    events = BST(balanced=True, multiset=True)
+    for key in [3, 1, 3, 3, 2, 1, 3]:
+        events.add(key)
+    events.remove_one(3)
+    print(f"Multiset: {len(events)} events in {len(list(events))} nodes, "
+          f"count(3) = {events.count(3)}, distinct {list(events)}, "
+          f"expanded {list(events.keys(expand=True))}, median {events.percentile(50)}")
+
+    # Morris traversal: O(1) extra memory (bst_benchmark.py measures it on a
+    # 1M-node chain); stopping early unwinds the temporary threads.
+    left_chain = BST()
+    for key in range(10, 0, -1):
+        left_chain.add(key)
+    print("Morris inorder:", list(left_chain.iter_morris(left_chain.root)))
+    early = left_chain.iter_morris(left_chain.root)
+    print("Morris first 3:", [next(early) for _ in range(3)])
+    early.close()  # unwinds the threads
+    print("Tree restored:", left_chain.tree_height() == 9 and list(left_chain) == list(range(1, 11)))
+
+    # TTL sweep: cut a whole window of expired timestamps in O(height).
+    log = BST.from_sorted(range(20), balanced=True)
+    expired = log.delete_range(0, 9)
+    print(f"delete_range removed {expired} keys, {len(log)} left, min {log.min_key()}")
+    log.add_sorted(range(20, 25))
+    print("add_sorted(20..24):", list(log), "height", log.tree_height())
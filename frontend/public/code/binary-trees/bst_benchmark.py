@@ -0,0 +1,304 @@
+"""
+BST Benchmark and Shape Profile
+===============================
+
+Measures bst.py against the two structures it usually competes with:
+
+- BST            plain, unbalanced
+- BST (AVL)      BST(balanced=True)
+- sorted list    a Python list kept sorted with bisect.insort
+- dict           a hash map of key -> count (no order, sorted on traversal)
+
+over four key streams that stress different shapes:
+
+- random         distinct keys in random order
+- sorted         0, 1, 2, ...          (a plain BST becomes a linked list)
+- zigzag         0, n-1, 1, n-2, ...   (a plain BST becomes two chains)
+- duplicates     n keys drawn from n // 100 distinct values
+
+For each pair it reports the time of n inserts, n searches (half misses),
+LCA of n random pairs (trees only), a full sorted traversal and deleting
+every other inserted key, plus the peak memory of the build (tracemalloc,
+measured in a separate run so tracing does not distort the timings) and,
+for trees, the height and the average node depth.
+
+morris_benchmark() compares the stack-based and the Morris inorder walk on a
+left-leaning chain, where the stack has to hold every node at once.
+
+bulk_benchmark() times the whole-tree operations on a large balanced tree:
+from_sorted, to_bytes/from_bytes against pickle, a delete_range TTL sweep
+of the oldest 30% of keys and an add_sorted batch of n / 2 newer keys.
+
+Usage: python bst_benchmark.py [n] [chain] [bulk]   (default n = 2000; a
+plain BST on sorted or zigzag input is O(n^2), so keep n modest when those
+rows run; chain and bulk default to 1_000_000 keys)
+"""
+
+import bisect
+import pickle
+import random
+import sys
+import time
+import tracemalloc
+
+from bst import BST, Node
+
+STREAMS = ("random", "sorted", "zigzag", "duplicates")
+
+
+def make_stream(kind, n, rng):
+    if kind == "random":
+        return rng.sample(range(10 * n), n)
+    if kind == "sorted":
+        return list(range(n))
+    if kind == "zigzag":
+        keys = []
+        lo, hi = 0, n - 1
+        while lo <= hi:
+            keys.append(lo)
+            if lo != hi:
+                keys.append(hi)
+            lo += 1
+            hi -= 1
+        return keys
+    if kind == "duplicates":
+        distinct = max(1, n // 100)
+        return [rng.randrange(distinct) for _ in range(n)]
+    raise ValueError(f"unknown stream {kind!r}")
+
+
+class _TreeAdapter:
+    def __init__(self, balanced):
+        self.tree = BST(balanced=balanced)
+        self.add = self.tree.add
+        self.remove = self.tree.remove
+        self.lca = self.tree.lca
+
+    def contains(self, key):
+        return key in self.tree
+
+    def traverse(self):
+        return sum(1 for _ in self.tree)
+
+    def shape(self):
+        """(height, average node depth)."""
+        root = self.tree.root
+        if root is None:
+            return -1, 0.0
+        total = count = depth = 0
+        level = [root]
+        while level:
+            total += depth * len(level)
+            count += len(level)
+            level = [c for node in level for c in (node.left, node.right) if c is not None]
+            depth += 1
+        return self.tree.tree_height(), total / count
+
+
+class _SortedListAdapter:
+    lca = None
+
+    def __init__(self):
+        self.keys = []
+
+    def add(self, key):
+        bisect.insort(self.keys, key)
+
+    def contains(self, key):
+        i = bisect.bisect_left(self.keys, key)
+        return i < len(self.keys) and self.keys[i] == key
+
+    def remove(self, key):
+        i = bisect.bisect_left(self.keys, key)
+        if i == len(self.keys) or self.keys[i] != key:
+            raise KeyError(key)
+        del self.keys[i]
+
+    def traverse(self):
+        return sum(1 for _ in self.keys)
+
+    def shape(self):
+        return None
+
+
+class _DictAdapter:
+    lca = None
+
+    def __init__(self):
+        self.counts = {}
+
+    def add(self, key):
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def contains(self, key):
+        return key in self.counts
+
+    def remove(self, key):
+        left = self.counts[key] - 1
+        if left:
+            self.counts[key] = left
+        else:
+            del self.counts[key]
+
+    def traverse(self):
+        return sum(1 for _ in sorted(self.counts))
+
+    def shape(self):
+        return None
+
+
+STRUCTURES = {
+    "BST": lambda: _TreeAdapter(balanced=False),
+    "BST (AVL)": lambda: _TreeAdapter(balanced=True),
+    "sorted list": _SortedListAdapter,
+    "dict": _DictAdapter,
+}
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def benchmark_one(make, keys, rng):
+    """Run every operation on a fresh structure built from keys."""
+    # Peak memory of the build, in its own (traced, slower) run.
+    tracemalloc.start()
+    traced = make()
+    for key in keys:
+        traced.add(key)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del traced
+
+    structure = make()
+    present = list(keys)
+    rng.shuffle(present)
+    # Every other probe is a key that was never inserted.
+    probes = [key if i % 2 else (1 << 40) + i for i, key in enumerate(present)]
+    pairs = [(rng.choice(keys), rng.choice(keys)) for _ in keys] if keys else []
+
+    def insert_all():
+        for key in keys:
+            structure.add(key)
+
+    def search_all():
+        for key in probes:
+            structure.contains(key)
+
+    def lca_all():
+        for a, b in pairs:
+            structure.lca(a, b)
+
+    def delete_half():
+        for key in present[::2]:
+            structure.remove(key)
+
+    row = {"insert": _timed(insert_all)}
+    shape = structure.shape()
+    row["search"] = _timed(search_all)
+    row["lca"] = _timed(lca_all) if structure.lca is not None else None
+    row["traverse"] = _timed(structure.traverse)
+    row["delete"] = _timed(delete_half)
+    row["peak_kib"] = peak / 1024
+    row["height"], row["avg_depth"] = shape if shape else (None, None)
+    return row
+
+
+def run(n=2000, streams=STREAMS, structures=tuple(STRUCTURES), seed=0):
+    """Benchmark every (stream, structure) pair; returns a list of rows."""
+    rng = random.Random(seed)
+    rows = []
+    for kind in streams:
+        keys = make_stream(kind, n, rng)
+        for name in structures:
+            row = benchmark_one(STRUCTURES[name], keys, random.Random(seed))
+            row.update(stream=kind, structure=name, n=n)
+            rows.append(row)
+    return rows
+
+
+def morris_benchmark(n=1_000_000):
+    """
+    Time and peak memory of a full inorder walk over an n-node left chain,
+    stack-based vs Morris. Returns {name: (seconds, peak bytes)}.
+    """
+    left_chain = BST()
+    nodes = [Node(key) for key in range(n)]
+    for below, above in zip(nodes, nodes[1:]):
+        above.left = below
+    for node in nodes:
+        left_chain._update(node)
+    left_chain.root = nodes[-1]
+    del nodes
+    results = {}
+    for name, walk in (("stack", left_chain.iter_inorder), ("morris", left_chain.iter_morris)):
+        tracemalloc.start()
+        start = time.perf_counter()
+        sum(walk(left_chain.root))
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results[name] = (elapsed, peak)
+    return results
+
+
+def bulk_benchmark(n=1_000_000):
+    """Seconds (and payload sizes) of the bulk operations on an n-key tree."""
+    result = {}
+    start = time.perf_counter()
+    tree = BST.from_sorted(range(n), balanced=True)
+    result["from_sorted"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    payload = tree.to_bytes()
+    restored = BST.from_bytes(payload)
+    result["to_bytes + from_bytes"] = time.perf_counter() - start
+    result["to_bytes size"] = len(payload)
+    start = time.perf_counter()
+    pickled = pickle.dumps(tree, protocol=pickle.HIGHEST_PROTOCOL)
+    pickle.loads(pickled)
+    result["pickle round trip"] = time.perf_counter() - start
+    result["pickle size"] = len(pickled)
+    assert list(restored) == list(tree)
+    del restored
+
+    result["delete_range 30%"] = _timed(tree.delete_range, 0, n * 3 // 10 - 1)
+    result["add_sorted n / 2"] = _timed(tree.add_sorted, range(n, n + n // 2))
+    result["final height"] = tree.tree_height()
+    return result
+
+
+def print_report(rows):
+    columns = ("insert", "search", "lca", "traverse", "delete")
+    header = (f"{'stream':<11}{'structure':<13}"
+              + "".join(f"{c + ' s':>11}" for c in columns)
+              + f"{'peak KiB':>10}{'height':>8}{'avg depth':>11}")
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        cells = "".join(f"{row[c]:>11.4f}" if row[c] is not None else f"{'-':>11}"
+                        for c in columns)
+        height = f"{row['height']:>8}" if row["height"] is not None else f"{'-':>8}"
+        depth = f"{row['avg_depth']:>11.1f}" if row["avg_depth"] is not None else f"{'-':>11}"
+        print(f"{row['stream']:<11}{row['structure']:<13}{cells}"
+              f"{row['peak_kib']:>10.0f}{height}{depth}")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    chain = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+    bulk = int(sys.argv[3]) if len(sys.argv) > 3 else 1_000_000
+    print(f"n = {n}\n")
+    print_report(run(n))
+    print()
+    for name, (elapsed, peak) in morris_benchmark(chain).items():
+        print(f"{name:>6} inorder over a {chain}-node left chain: {elapsed:.2f}s, "
+              f"peak extra memory {peak / 1024:.0f} KiB")
+    print(f"\nBulk operations on {bulk} keys:")
+    for name, value in bulk_benchmark(bulk).items():
+        if isinstance(value, float):
+            print(f"  {name:<22}{value:>10.4f}s")
+        else:
+            print(f"  {name:<22}{value:>11}")
@@ -0,0 +1,291 @@
+"""
+Array-Backed BST (Node Pool)
+============================
+
+Even with __slots__, every `Node` of bst.py is a full Python object: a
+header, three pointers, a boxed key and a boxed height. For tens of millions
+of numeric keys that overhead dominates.
+
+PooledBST stores the whole tree in parallel typed arrays instead:
+
+    keys[i]     the key of node i        (array "q" ints or "d" floats, 8 bytes)
+    left[i]     index of the left child  (array "i", -1 = none, 4 bytes)
+    right[i]    index of the right child (array "i", -1 = none, 4 bytes)
+    heights[i]  subtree height           (array "b", 1 byte)
+
+That is 17 bytes per key. Deleted slots go on a free list and are reused.
+The owned-root API mirrors BST: add, remove, in, find, min_key, max_key, lca,
+tree_height, len, iteration (with seek and reverse) and from_sorted, with the
+same optional AVL balancing.
+"""
+
+import time
+from array import array
+
+NIL = -1
+
+
+class PooledBST:
+    """A BST whose nodes are slots in parallel typed arrays."""
+
+    def __init__(self, typecode="q", balanced=False):
+        if typecode not in ("q", "d"):
+            raise ValueError('typecode must be "q" (int keys) or "d" (float keys)')
+        self.keys = array(typecode)
+        self.left = array("i")
+        self.right = array("i")
+        self.heights = array("b")
+        self.free = array("i")
+        self.root = NIL
+        self.balanced = balanced
+        self._len = 0
+
+    @classmethod
+    def from_sorted(cls, iterable, typecode="q", balanced=False):
+        """Build a perfectly balanced pool from sorted keys in O(n)."""
+        tree = cls(typecode, balanced)
+        keys = array(typecode, iterable)
+        n = len(keys)
+        for i in range(1, n):
+            if keys[i] < keys[i - 1]:
+                raise ValueError("from_sorted() needs keys in non-decreasing order")
+        tree.keys = keys
+        tree.left = array("i", [NIL]) * n
+        tree.right = array("i", [NIL]) * n
+        tree.heights = array("b", [0]) * n
+        # Slot i holds the i-th smallest key; link ranges middle-first.
+        stack = [(0, n - 1)] if n else []
+        while stack:
+            lo, hi = stack.pop()
+            mid = (lo + hi) // 2
+            tree.heights[mid] = (hi - lo + 1).bit_length() - 1
+            if lo < mid:
+                tree.left[mid] = (lo + mid - 1) // 2
+                stack.append((lo, mid - 1))
+            if mid < hi:
+                tree.right[mid] = (mid + 1 + hi) // 2
+                stack.append((mid + 1, hi))
+        tree.root = (n - 1) // 2 if n else NIL
+        tree._len = n
+        return tree
+
+    def __len__(self):
+        return self._len
+
+    def _alloc(self, key):
+        if self.free:
+            i = self.free.pop()
+            self.keys[i] = key
+            self.left[i] = self.right[i] = NIL
+            self.heights[i] = 0
+            return i
+        self.keys.append(key)
+        self.left.append(NIL)
+        self.right.append(NIL)
+        self.heights.append(0)
+        return len(self.keys) - 1
+
+    def _height(self, i):
+        return self.heights[i] if i != NIL else -1
+
+    def _update(self, i):
+        self.heights[i] = 1 + max(self._height(self.left[i]), self._height(self.right[i]))
+
+    def _rotate_left(self, i):
+        pivot = self.right[i]
+        self.right[i] = self.left[pivot]
+        self.left[pivot] = i
+        self._update(i)
+        self._update(pivot)
+        return pivot
+
+    def _rotate_right(self, i):
+        pivot = self.left[i]
+        self.left[i] = self.right[pivot]
+        self.right[pivot] = i
+        self._update(i)
+        self._update(pivot)
+        return pivot
+
+    def _rebalance(self, i):
+        self._update(i)
+        left, right = self.left[i], self.right[i]
+        balance = self._height(left) - self._height(right)
+        if balance > 1:
+            if self._height(self.left[left]) < self._height(self.right[left]):
+                self.left[i] = self._rotate_left(left)
+            return self._rotate_right(i)
+        if balance < -1:
+            if self._height(self.right[right]) < self._height(self.left[right]):
+                self.right[i] = self._rotate_right(right)
+            return self._rotate_left(i)
+        return i
+
+    def _fix_path(self, path):
+        if not self.balanced:
+            return path[0]
+        for k in range(len(path) - 1, -1, -1):
+            i = path[k]
+            new = self._rebalance(i)
+            if new != i and k > 0:
+                parent = path[k - 1]
+                if self.left[parent] == i:
+                    self.left[parent] = new
+                else:
+                    self.right[parent] = new
+            path[k] = new
+        return path[0]
+
+    def add(self, key):
+        node = self._alloc(key)
+        self._len += 1
+        if self.root == NIL:
+            self.root = node
+            return
+        keys, left, right = self.keys, self.left, self.right
+        path = []
+        i = self.root
+        while i != NIL:
+            path.append(i)
+            i = left[i] if key < keys[i] else right[i]
+        parent = path[-1]
+        if key < keys[parent]:
+            left[parent] = node
+        else:
+            right[parent] = node
+        self.root = self._fix_path(path)
+
+    def find(self, key):
+        """Slot index holding key, or NIL."""
+        keys, left, right = self.keys, self.left, self.right
+        i = self.root
+        while i != NIL and keys[i] != key:
+            i = left[i] if key < keys[i] else right[i]
+        return i
+
+    def __contains__(self, key):
+        return self.find(key) != NIL
+
+    def remove(self, key):
+        """Delete one occurrence of key, raising KeyError if it is absent."""
+        keys, left, right = self.keys, self.left, self.right
+        path = []
+        i = self.root
+        while i != NIL and keys[i] != key:
+            path.append(i)
+            i = left[i] if key < keys[i] else right[i]
+        if i == NIL:
+            raise KeyError(key)
+
+        target = i
+        if left[i] != NIL and right[i] != NIL:
+            path.append(i)
+            target = right[i]
+            while left[target] != NIL:
+                path.append(target)
+                target = left[target]
+            keys[i] = keys[target]
+
+        replacement = left[target] if left[target] != NIL else right[target]
+        self.free.append(target)
+        self._len -= 1
+        if not path:
+            self.root = replacement
+            return
+        parent = path[-1]
+        if left[parent] == target:
+            left[parent] = replacement
+        else:
+            right[parent] = replacement
+        self.root = self._fix_path(path)
+
+    def min_key(self):
+        if self.root == NIL:
+            raise ValueError("min_key() of an empty tree")
+        i = self.root
+        while self.left[i] != NIL:
+            i = self.left[i]
+        return self.keys[i]
+
+    def max_key(self):
+        if self.root == NIL:
+            raise ValueError("max_key() of an empty tree")
+        i = self.root
+        while self.right[i] != NIL:
+            i = self.right[i]
+        return self.keys[i]
+
+    def lca(self, n1, n2):
+        keys = self.keys
+        i = self.root
+        while i != NIL:
+            if keys[i] > n1 and keys[i] > n2:
+                i = self.left[i]
+            elif keys[i] < n1 and keys[i] < n2:
+                i = self.right[i]
+            else:
+                return keys[i]
+        return None
+
+    def tree_height(self):
+        if self.root == NIL:
+            return -1
+        if self.balanced:
+            return self.heights[self.root]
+        height = -1
+        level = [self.root]
+        while level:
+            height += 1
+            level = [c for i in level for c in (self.left[i], self.right[i]) if c != NIL]
+        return height
+
+    def keys_from(self, start=None, reverse=False):
+        """Lazy in-order walk of keys, optionally seeking to start first."""
+        keys = self.keys
+        near, far = (self.right, self.left) if reverse else (self.left, self.right)
+        stack = []
+        i = self.root
+        while i != NIL:
+            if start is None or ((keys[i] <= start) if reverse else (keys[i] >= start)):
+                stack.append(i)
+                i = near[i]
+            else:
+                i = far[i]
+        while stack:
+            i = stack.pop()
+            yield keys[i]
+            i = far[i]
+            while i != NIL:
+                stack.append(i)
+                i = near[i]
+
+    def __iter__(self):
+        return self.keys_from()
+
+    def __reversed__(self):
+        return self.keys_from(reverse=True)
+
+    def memory_bytes(self):
+        """Bytes held by the node arrays (including free slots)."""
+        arrays = (self.keys, self.left, self.right, self.heights, self.free)
+        return sum(a.itemsize * len(a) for a in arrays)
+
+
+if __name__ == "__main__":
+    tree = PooledBST(balanced=True)
+    for key in [20, 10, 30, 5, 15, 25, 35]:
+        tree.add(key)
+    print("Inorder:", list(tree))
+    print("15 in tree:", 15 in tree)
+    print("Min / max:", tree.min_key(), tree.max_key())
+    print("LCA of 5 and 15:", tree.lca(5, 15))
+    tree.remove(10)
+    print("After deleting 10:", list(tree), "height", tree.tree_height())
+
+    n = 1_000_000
+    start = time.perf_counter()
+    big = PooledBST.from_sorted(range(n), balanced=True)
+    print(f"\nfrom_sorted({n}): {time.perf_counter() - start:.2f}s, "
+          f"height {big.tree_height()}, "
+          f"{big.memory_bytes() / n:.0f} bytes per key")
+    print("Keys from 999_997:", list(big.keys_from(999_997)))
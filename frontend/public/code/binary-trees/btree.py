@@ -0,0 +1,334 @@
+"""
+B+ Tree (High-Fanout Ordered Set)
+=================================
+
+A balanced binary tree still follows one pointer per level: ~20 levels, and
+~20 cache misses, for a million keys. A B+ tree stores up to `order` keys per
+node in a sorted Python list and searches each node with `bisect`, so the
+same million keys sit only 3-4 levels deep.
+
+Layout:
+- Internal nodes: separator keys + children. Child i holds keys in
+  [keys[i - 1], keys[i]); a lookup follows bisect_right(keys, key).
+- Leaves: sorted key lists linked both ways (next / prev), so range scans
+  and full iteration run leaf by leaf without going back up the tree.
+- Every node except the root holds between order // 2 and order entries.
+
+API (mirrors the owned-root API of BST in bst.py, as an ordered *set*):
+add, remove, in, min_key, max_key, range(lo, hi, inclusive, offset, limit),
+iteration (forward and reversed), len, from_sorted.
+
+Time Complexity: O(log_order(n) * log2(order)) for search / add / remove
+Space Complexity: O(n)
+"""
+
+import random
+import time
+from bisect import bisect_left, bisect_right
+
+
+class _Leaf:
+    __slots__ = ("keys", "next", "prev")
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.next = None
+        self.prev = None
+
+
+class _Internal:
+    __slots__ = ("keys", "children")
+
+    def __init__(self, keys, children):
+        self.keys = keys
+        self.children = children
+
+
+def _entries(node):
+    return len(node.keys) if isinstance(node, _Leaf) else len(node.children)
+
+
+class BPlusTree:
+    """An ordered set stored in a B+ tree with configurable node order."""
+
+    def __init__(self, order=64):
+        if order < 4:
+            raise ValueError("order must be at least 4")
+        self.order = order
+        self.min_entries = order // 2
+        self.root = _Leaf([])
+        self._len = 0
+
+    @classmethod
+    def from_sorted(cls, iterable, order=64):
+        """Bulk-load strictly increasing keys bottom-up in O(n)."""
+        keys = list(iterable)
+        for i in range(1, len(keys)):
+            if keys[i] <= keys[i - 1]:
+                raise ValueError("from_sorted() needs strictly increasing keys")
+        tree = cls(order)
+        if not keys:
+            return tree
+
+        # Leaves: spread the keys evenly so none is under-full.
+        leaves = [_Leaf(chunk) for chunk in cls._even_chunks(keys, order)]
+        for left, right in zip(leaves, leaves[1:]):
+            left.next = right
+            right.prev = left
+
+        level = leaves
+        lows = [leaf.keys[0] for leaf in leaves]  # smallest key under each node
+        while len(level) > 1:
+            parents, parent_lows = [], []
+            start = 0
+            for chunk in cls._even_chunks(level, order):
+                end = start + len(chunk)
+                parents.append(_Internal(lows[start + 1:end], chunk))
+                parent_lows.append(lows[start])
+                start = end
+            level, lows = parents, parent_lows
+        tree.root = level[0]
+        tree._len = len(keys)
+        return tree
+
+    @staticmethod
+    def _even_chunks(items, order):
+        count = -(-len(items) // order)  # ceil
+        size, extra = divmod(len(items), count)
+        chunks = []
+        start = 0
+        for i in range(count):
+            end = start + size + (1 if i < extra else 0)
+            chunks.append(items[start:end])
+            start = end
+        return chunks
+
+    def __len__(self):
+        return self._len
+
+    def _find_leaf(self, key, path=None):
+        node = self.root
+        while isinstance(node, _Internal):
+            i = bisect_right(node.keys, key)
+            if path is not None:
+                path.append((node, i))
+            node = node.children[i]
+        return node
+
+    def __contains__(self, key):
+        # Hot path: inlined descent, exact type check instead of isinstance.
+        node = self.root
+        while type(node) is _Internal:
+            node = node.children[bisect_right(node.keys, key)]
+        keys = node.keys
+        i = bisect_left(keys, key)
+        return i < len(keys) and keys[i] == key
+
+    def add(self, key):
+        """Insert key; returns False if it was already present."""
+        path = []
+        leaf = self._find_leaf(key, path)
+        i = bisect_left(leaf.keys, key)
+        if i < len(leaf.keys) and leaf.keys[i] == key:
+            return False
+        leaf.keys.insert(i, key)
+        self._len += 1
+        if len(leaf.keys) <= self.order:
+            return True
+
+        # Split the leaf, then push separators up while parents overflow.
+        mid = len(leaf.keys) // 2
+        right = _Leaf(leaf.keys[mid:])
+        leaf.keys = leaf.keys[:mid]
+        right.next = leaf.next
+        right.prev = leaf
+        if leaf.next is not None:
+            leaf.next.prev = right
+        leaf.next = right
+        separator, new_child = right.keys[0], right
+
+        while path:
+            parent, i = path.pop()
+            parent.keys.insert(i, separator)
+            parent.children.insert(i + 1, new_child)
+            if len(parent.children) <= self.order:
+                return True
+            mid = len(parent.children) // 2
+            separator = parent.keys[mid - 1]
+            new_child = _Internal(parent.keys[mid:], parent.children[mid:])
+            parent.keys = parent.keys[:mid - 1]
+            parent.children = parent.children[:mid]
+        self.root = _Internal([separator], [self.root, new_child])
+        return True
+
+    def remove(self, key):
+        """Delete key, raising KeyError if it is absent."""
+        path = []
+        leaf = self._find_leaf(key, path)
+        i = bisect_left(leaf.keys, key)
+        if i == len(leaf.keys) or leaf.keys[i] != key:
+            raise KeyError(key)
+        del leaf.keys[i]
+        self._len -= 1
+
+        child = leaf
+        while path and _entries(child) < self.min_entries:
+            parent, i = path.pop()
+            left = parent.children[i - 1] if i > 0 else None
+            right = parent.children[i + 1] if i + 1 < len(parent.children) else None
+
+            if left is not None and _entries(left) > self.min_entries:
+                self._borrow_from_left(parent, i, left, child)
+                break
+            if right is not None and _entries(right) > self.min_entries:
+                self._borrow_from_right(parent, i, child, right)
+                break
+            if left is not None:
+                self._merge(parent, i - 1, left, child)
+            else:
+                self._merge(parent, i, child, right)
+            child = parent
+
+        if isinstance(self.root, _Internal) and len(self.root.children) == 1:
+            self.root = self.root.children[0]
+
+    def _borrow_from_left(self, parent, i, left, child):
+        if isinstance(child, _Leaf):
+            child.keys.insert(0, left.keys.pop())
+            parent.keys[i - 1] = child.keys[0]
+        else:
+            child.keys.insert(0, parent.keys[i - 1])
+            parent.keys[i - 1] = left.keys.pop()
+            child.children.insert(0, left.children.pop())
+
+    def _borrow_from_right(self, parent, i, child, right):
+        if isinstance(child, _Leaf):
+            child.keys.append(right.keys.pop(0))
+            parent.keys[i] = right.keys[0]
+        else:
+            child.keys.append(parent.keys[i])
+            parent.keys[i] = right.keys.pop(0)
+            child.children.append(right.children.pop(0))
+
+    def _merge(self, parent, i, left, right):
+        """Fold parent.children[i + 1] (right) into parent.children[i] (left)."""
+        if isinstance(left, _Leaf):
+            left.keys.extend(right.keys)
+            left.next = right.next
+            if right.next is not None:
+                right.next.prev = left
+        else:
+            left.keys.append(parent.keys[i])
+            left.keys.extend(right.keys)
+            left.children.extend(right.children)
+        del parent.keys[i]
+        del parent.children[i + 1]
+
+    def _first_leaf(self):
+        node = self.root
+        while isinstance(node, _Internal):
+            node = node.children[0]
+        return node
+
+    def _last_leaf(self):
+        node = self.root
+        while isinstance(node, _Internal):
+            node = node.children[-1]
+        return node
+
+    def min_key(self):
+        if not self._len:
+            raise ValueError("min_key() of an empty tree")
+        return self._first_leaf().keys[0]
+
+    def max_key(self):
+        if not self._len:
+            raise ValueError("max_key() of an empty tree")
+        return self._last_leaf().keys[-1]
+
+    def __iter__(self):
+        leaf = self._first_leaf()
+        while leaf is not None:
+            yield from leaf.keys
+            leaf = leaf.next
+
+    def __reversed__(self):
+        leaf = self._last_leaf()
+        while leaf is not None:
+            yield from reversed(leaf.keys)
+            leaf = leaf.prev
+
+    def range(self, lo=None, hi=None, inclusive=(True, True), offset=0, limit=None):
+        """Lazily yield keys between lo and hi, walking the leaf chain."""
+        if isinstance(inclusive, bool):
+            inclusive = (inclusive, inclusive)
+        lo_inclusive, hi_inclusive = inclusive
+        if lo is None:
+            leaf, i = self._first_leaf(), 0
+        else:
+            leaf = self._find_leaf(lo)
+            i = bisect_left(leaf.keys, lo) if lo_inclusive else bisect_right(leaf.keys, lo)
+        remaining = limit
+        while leaf is not None and remaining != 0:
+            keys = leaf.keys
+            if hi is None:
+                end = len(keys)
+            else:
+                end = bisect_right(keys, hi) if hi_inclusive else bisect_left(keys, hi)
+            if offset:
+                skipped = min(offset, max(0, end - i))
+                i += skipped
+                offset -= skipped
+            if remaining is not None:
+                end = min(end, i + remaining)
+                remaining -= max(0, end - i)
+            yield from keys[i:end]
+            if end < len(keys):
+                return  # stopped inside this leaf: hi or limit reached
+            leaf, i = leaf.next, 0
+
+    def height(self):
+        """Number of levels below the root (0 for a single leaf)."""
+        levels = 0
+        node = self.root
+        while isinstance(node, _Internal):
+            node = node.children[0]
+            levels += 1
+        return levels
+
+
+if __name__ == "__main__":
+    tree = BPlusTree(order=4)
+    for key in [20, 10, 30, 5, 15, 25, 35, 40, 45, 50]:
+        tree.add(key)
+    print("Keys:", list(tree))
+    print("15 in tree:", 15 in tree, "| 16 in tree:", 16 in tree)
+    print("Min / max:", tree.min_key(), tree.max_key())
+    print("Range [12, 40):", list(tree.range(12, 40, inclusive=(True, False))))
+    tree.remove(10)
+    tree.remove(30)
+    print("After deleting 10 and 30:", list(tree), "height", tree.height())
+    print("Descending:", list(reversed(tree)))
+
+    # Compare with the balanced binary BST at a million keys.
+    from bst import BST
+
+    n = 1_000_000
+    start = time.perf_counter()
+    btree = BPlusTree.from_sorted(range(n))
+    print(f"\nB+ tree bulk load ({n}): {time.perf_counter() - start:.2f}s, height {btree.height()}")
+    start = time.perf_counter()
+    bst = BST.from_sorted(range(n), balanced=True)
+    print(f"BST bulk load ({n}): {time.perf_counter() - start:.2f}s, height {bst.tree_height()}")
+
+    rng = random.Random(0)
+    probes = [rng.randrange(2 * n) for _ in range(200_000)]
+    for name, structure in (("B+ tree", btree), ("BST", bst)):
+        start = time.perf_counter()
+        hits = sum(1 for key in probes if key in structure)
+        lookups = time.perf_counter() - start
+        start = time.perf_counter()
+        scanned = sum(1 for _ in structure.range(100_000, 600_000))
+        scan = time.perf_counter() - start
+        print(f"{name:>8}: {len(probes)} lookups ({hits} hits) {lookups:.2f}s, "
+              f"range scan of {scanned} keys {scan:.2f}s")
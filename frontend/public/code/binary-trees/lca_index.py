@@ -0,0 +1,189 @@
+"""
+Batch LCA Queries: Euler Tour + Sparse Table
+============================================
+
+`BST.find_lca` walks down from the root comparing values: O(height) per pair,
+and it only works because the tree is a search tree. For large batches of
+queries (or for any binary tree) the LCA reduces to a range-minimum query:
+
+1. Euler tour: write down every node each time the DFS enters or returns to
+   it (2n - 1 entries) together with its depth, and remember the first
+   position of every node.
+2. The LCA of u and v is the shallowest node in the tour between their first
+   positions.
+3. A sparse table keeps, for every start i and power of two 2^j, the
+   position of the minimum depth in tour[i : i + 2^j]. Any range is covered
+   by two overlapping power-of-two windows, so each query is O(1).
+
+Built from a BST, the index remembers the tree's `version` and rebuilds
+itself lazily on the next query after any insert or delete.
+
+Build: O(n log n) time and memory
+Query: O(1)
+"""
+
+from array import array
+
+from bst import BST
+
+
+class LCAIndex:
+    """
+    O(1) lowest-common-ancestor queries over a binary tree.
+
+    Args:
+        tree: a BST (rebuilt automatically when it changes), or the root
+              node of any binary tree with .left / .right (call rebuild()
+              yourself after changing it).
+    """
+
+    def __init__(self, tree):
+        if isinstance(tree, BST):
+            self.tree = tree
+            self.root = tree.root
+        else:
+            self.tree = None
+            self.root = tree
+        self.rebuild()
+
+    def rebuild(self):
+        if self.tree is not None:
+            self.root = self.tree.root
+            self.version = self.tree.version
+        nodes = []        # id -> node
+        ids = {}          # id(node) -> id
+        first = []        # id -> first position in the tour
+        tour = array("i")
+        depths = array("i")
+
+        if self.root is not None:
+            # Iterative DFS; each stack entry is (node, depth, next child slot).
+            stack = [(self.root, 0, 0)]
+            while stack:
+                node, depth, slot = stack.pop()
+                if slot == 0:
+                    ids[id(node)] = len(nodes)
+                    first.append(len(tour))
+                    nodes.append(node)
+                tour.append(ids[id(node)])
+                depths.append(depth)
+                children = (node.left, node.right)
+                while slot < 2 and children[slot] is None:
+                    slot += 1
+                if slot < 2:
+                    stack.append((node, depth, slot + 1))
+                    stack.append((children[slot], depth + 1, 0))
+
+        self.nodes = nodes
+        self.ids = ids
+        self.first = array("i", first)
+        self.tour = tour
+        self.depths = depths
+        self.keys = None  # key -> id map, built on the first key query
+        self._build_sparse_table()
+
+    def _build_sparse_table(self):
+        depths = self.depths
+        level = array("i", range(len(depths)))
+        table = [level]
+        width = 1
+        while 2 * width <= len(depths):
+            prev = level
+            level = array("i", [0]) * (len(depths) - 2 * width + 1)
+            for i in range(len(level)):
+                a, b = prev[i], prev[i + width]
+                level[i] = a if depths[a] <= depths[b] else b
+            table.append(level)
+            width *= 2
+        self.table = table
+
+    def _ensure_fresh(self):
+        if self.tree is not None and (
+            self.tree.version != self.version or self.tree.root is not self.root
+        ):
+            self.rebuild()
+
+    def _lca_id(self, a, b):
+        lo, hi = self.first[a], self.first[b]
+        if lo > hi:
+            lo, hi = hi, lo
+        j = (hi - lo + 1).bit_length() - 1
+        left, right = self.table[j][lo], self.table[j][hi - (1 << j) + 1]
+        best = left if self.depths[left] <= self.depths[right] else right
+        return self.tour[best]
+
+    def lca(self, u, v):
+        """LCA of two nodes of the tree."""
+        self._ensure_fresh()
+        try:
+            a, b = self.ids[id(u)], self.ids[id(v)]
+        except KeyError:
+            raise ValueError("both nodes must belong to the indexed tree") from None
+        return self.nodes[self._lca_id(a, b)]
+
+    def _key_ids(self):
+        """key -> id of its shallowest node (the tour is in preorder)."""
+        self._ensure_fresh()
+        if self.keys is None:
+            self.keys = {}
+            for node in self.nodes:
+                self.keys.setdefault(node.val, self.ids[id(node)])
+        return self.keys
+
+    def lca_keys(self, k1, k2):
+        """LCA (as a key) of the nodes holding k1 and k2."""
+        keys = self._key_ids()
+        return self.nodes[self._lca_id(keys[k1], keys[k2])].val
+
+    def batch(self, pairs):
+        """LCA keys for an iterable of (k1, k2) pairs."""
+        keys, nodes, lca_id = self._key_ids(), self.nodes, self._lca_id
+        return [nodes[lca_id(keys[k1], keys[k2])].val for k1, k2 in pairs]
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    bst = BST()
+    for key in [20, 10, 30, 5, 15, 25, 35]:
+        bst.add(key)
+    index = LCAIndex(bst)
+    print("LCA(5, 15):", index.lca_keys(5, 15))   # 10
+    print("LCA(5, 35):", index.lca_keys(5, 35))   # 20
+    print("Batch:", index.batch([(25, 35), (15, 10), (5, 5)]))  # [30, 10, 5]
+
+    bst.add(12)   # index notices the new version on the next query
+    print("LCA(12, 5) after insert:", index.lca_keys(12, 5))  # 10
+
+    # Any binary tree works, not only search trees.
+    class TreeNode:
+        def __init__(self, val, left=None, right=None):
+            self.val, self.left, self.right = val, left, right
+
+    d, e = TreeNode("D"), TreeNode("E")
+    b = TreeNode("B", d, e)
+    c = TreeNode("C")
+    root = TreeNode("A", b, c)
+    general = LCAIndex(root)
+    print("LCA(D, E):", general.lca(d, e).val, "| LCA(D, C):", general.lca(d, c).val)
+
+    # Large batch on a deep tree: nearly sorted keys (e.g. timestamps that
+    # arrive slightly out of order) make find_lca walk O(height) per pair.
+    n = 20_000
+    keys = [i + random.randint(0, 50) for i in range(n)]
+    deep = BST()
+    for key in keys:
+        deep.add(key)
+    pairs = [(random.choice(keys), random.choice(keys)) for _ in range(20_000)]
+    start = time.perf_counter()
+    index = LCAIndex(deep)
+    built = time.perf_counter() - start
+    answers = index.batch(pairs)
+    total = time.perf_counter() - start
+    start = time.perf_counter()
+    expected = [deep.lca(a, b) for a, b in pairs]
+    walk = time.perf_counter() - start
+    assert answers == expected
+    print(f"Tree height {deep.tree_height()}, {len(pairs)} queries: "
+          f"index {total:.2f}s (build {built:.2f}s), find_lca walks {walk:.2f}s")
@@ -0,0 +1,263 @@
+"""
+Persistent (Path-Copying) BST
+=============================
+
+`BST.insert` and `delete_node` change nodes in place, so a reader walking the
+tree while a writer updates it can see a half-finished rotation. Here nodes
+are never modified after creation. An update copies only the nodes on the
+root-to-key path (O(log n) of them, the tree is AVL-balanced), and every
+untouched subtree is shared between the old and the new version:
+
+    v1:      20              v2 = v1.add(27):      20'
+            /  \\                                  /   \\
+          10    30                              10     30'
+               /                                      /
+             25                                     25'
+                                                      \\
+                                                       27
+
+A version is just a root pointer, so a reader can keep a snapshot for as long
+as it likes while writers keep publishing new ones. Once the last reference
+to an old version goes away, the nodes only it used are freed by ordinary
+reference counting.
+
+Time Complexity: O(log n) per update (new nodes), O(log n) per lookup
+Space Complexity: O(log n) extra per retained version
+"""
+
+import threading
+import weakref
+
+
+class _PNode:
+    """Immutable AVL node (by convention: never assigned after __init__)."""
+    __slots__ = ("val", "left", "right", "height", "size")
+
+    def __init__(self, val, left, right):
+        self.val = val
+        self.left = left
+        self.right = right
+        self.height = 1 + max(_height(left), _height(right))
+        self.size = 1 + _size(left) + _size(right)
+
+
+def _height(node):
+    return node.height if node else -1
+
+
+def _size(node):
+    return node.size if node else 0
+
+
+def _balance(val, left, right):
+    """New node for (val, left, right), rotated if the AVL property breaks."""
+    diff = _height(left) - _height(right)
+    if diff > 1:
+        if _height(left.left) < _height(left.right):
+            pivot = left.right
+            left = _PNode(pivot.val, _PNode(left.val, left.left, pivot.left), pivot.right)
+        return _PNode(left.val, left.left, _PNode(val, left.right, right))
+    if diff < -1:
+        if _height(right.right) < _height(right.left):
+            pivot = right.left
+            right = _PNode(pivot.val, pivot.left, _PNode(right.val, pivot.right, right.right))
+        return _PNode(right.val, _PNode(val, left, right.left), right.right)
+    return _PNode(val, left, right)
+
+
+def _rebuild_path(path, child):
+    """Copy the recorded path bottom-up on top of the new child subtree."""
+    for node, went_left in reversed(path):
+        if went_left:
+            child = _balance(node.val, child, node.right)
+        else:
+            child = _balance(node.val, node.left, child)
+    return child
+
+
+class PersistentBST:
+    """
+    One immutable version of an ordered multiset.
+
+    add() / remove() return a new PersistentBST and leave this one intact,
+    so any number of threads can read a version without locks.
+    """
+
+    def __init__(self, root=None):
+        self.root = root
+
+    @classmethod
+    def from_sorted(cls, iterable):
+        """Build a balanced version from sorted keys in O(n)."""
+        keys = list(iterable)
+        for i in range(1, len(keys)):
+            if keys[i] < keys[i - 1]:
+                raise ValueError("from_sorted() needs keys in non-decreasing order")
+        if not keys:
+            return cls()
+        # Children must exist before their parent: fill ranges bottom-up.
+        built = {}
+        order = []
+        stack = [(0, len(keys) - 1)]
+        while stack:
+            lo, hi = stack.pop()
+            order.append((lo, hi))
+            mid = (lo + hi) // 2
+            if lo < mid:
+                stack.append((lo, mid - 1))
+            if mid < hi:
+                stack.append((mid + 1, hi))
+        for lo, hi in reversed(order):
+            mid = (lo + hi) // 2
+            left = built.pop((lo, mid - 1), None)
+            right = built.pop((mid + 1, hi), None)
+            built[(lo, hi)] = _PNode(keys[mid], left, right)
+        return cls(built[(0, len(keys) - 1)])
+
+    def add(self, key):
+        path = []
+        node = self.root
+        while node is not None:
+            went_left = key < node.val
+            path.append((node, went_left))
+            node = node.left if went_left else node.right
+        return PersistentBST(_rebuild_path(path, _PNode(key, None, None)))
+
+    def remove(self, key):
+        """New version without one occurrence of key (KeyError if absent)."""
+        path = []
+        node = self.root
+        while node is not None and node.val != key:
+            went_left = key < node.val
+            path.append((node, went_left))
+            node = node.left if went_left else node.right
+        if node is None:
+            raise KeyError(key)
+
+        if node.left is None or node.right is None:
+            replacement = node.left if node.left is not None else node.right
+        else:
+            # Pull the successor out of the right subtree (copying its path)
+            # and put it where the removed node was.
+            right_path = []
+            successor = node.right
+            while successor.left is not None:
+                right_path.append((successor, True))
+                successor = successor.left
+            new_right = _rebuild_path(right_path, successor.right)
+            replacement = _balance(successor.val, node.left, new_right)
+        return PersistentBST(_rebuild_path(path, replacement))
+
+    def __len__(self):
+        return _size(self.root)
+
+    def __contains__(self, key):
+        node = self.root
+        while node is not None and node.val != key:
+            node = node.left if key < node.val else node.right
+        return node is not None
+
+    def __iter__(self):
+        stack = []
+        node = self.root
+        while stack or node:
+            if node:
+                stack.append(node)
+                node = node.left
+            else:
+                node = stack.pop()
+                yield node.val
+                node = node.right
+
+    def min_key(self):
+        if self.root is None:
+            raise ValueError("min_key() of an empty tree")
+        node = self.root
+        while node.left is not None:
+            node = node.left
+        return node.val
+
+    def max_key(self):
+        if self.root is None:
+            raise ValueError("max_key() of an empty tree")
+        node = self.root
+        while node.right is not None:
+            node = node.right
+        return node.val
+
+    def lca(self, n1, n2):
+        node = self.root
+        while node is not None:
+            if node.val > n1 and node.val > n2:
+                node = node.left
+            elif node.val < n1 and node.val < n2:
+                node = node.right
+            else:
+                return node.val
+        return None
+
+    def tree_height(self):
+        return _height(self.root)
+
+
+class VersionedBST:
+    """
+    Writer handle around PersistentBST versions.
+
+    Writers are serialized by a lock and publish a new version with a single
+    reference assignment; snapshot() is lock-free and returns whatever
+    version is current. A reader's snapshot never changes under it.
+    """
+
+    def __init__(self, iterable=()):
+        self._current = PersistentBST.from_sorted(sorted(iterable))
+        self._write_lock = threading.Lock()
+
+    def snapshot(self):
+        return self._current
+
+    def add(self, key):
+        with self._write_lock:
+            self._current = self._current.add(key)
+
+    def remove(self, key):
+        with self._write_lock:
+            self._current = self._current.remove(key)
+
+    def __contains__(self, key):
+        return key in self._current
+
+    def __len__(self):
+        return len(self._current)
+
+
+if __name__ == "__main__":
+    v1 = PersistentBST()
+    for key in [20, 10, 30, 25]:
+        v1 = v1.add(key)
+    v2 = v1.add(27)
+    v3 = v2.remove(20)
+    print("v1:", list(v1))   # [10, 20, 25, 30]
+    print("v2:", list(v2))   # [10, 20, 25, 27, 30]
+    print("v3:", list(v3))   # [10, 25, 27, 30]
+    print("Shared subtree (10) between v1 and v2:", v1.root.left is v2.root.left)
+
+    # Sorted inserts stay balanced and each one copies only O(log n) nodes.
+    index = VersionedBST()
+    for key in range(100_000):
+        index.add(key)
+    print("Height after 100000 sorted adds:", index.snapshot().tree_height())
+
+    # A reader holds a snapshot while the writer keeps going.
+    reader_view = index.snapshot()
+    for key in range(100_000, 100_010):
+        index.add(key)
+    print("Reader still sees", len(reader_view), "keys; current has", len(index))
+
+    # Released versions are reclaimed by normal reference counting.
+    alive = weakref.WeakSet()
+    for key in range(5):
+        index.add(-key)
+        alive.add(index.snapshot())
+    del reader_view
+    print("Versions still alive (only the current one):", len(alive))
@@ -1,4 +1,7 @@
 
+from array import array
+
+
 class Graph:
     def __init__(self):
         self.adj_list = {}
@@ -21,6 +24,52 @@ class Graph:
     def display(self):
         for vertex, edges in self.adj_list.items():
             print(f"{vertex}: {edges}")
+
+    def freeze(self):
+        return FrozenGraph.from_graph(self)
+
+
+class FrozenGraph:
+    """
+    Read-only compressed (CSR) form of a Graph.
+
+    Vertices are renumbered 0..n-1; the neighbours of vertex i are
+    targets[offsets[i]:offsets[i + 1]]. Both are flat array('i') buffers,
+    so a traversal walks contiguous memory instead of chasing lists.
+    """
+
+    def __init__(self, vertices, offsets, targets):
+        self.vertices = vertices                 # id -> original vertex
+        self.index = {v: i for i, v in enumerate(vertices)}
+        self.offsets = offsets
+        self.targets = targets
+
+    @classmethod
+    def from_graph(cls, graph):
+        vertices = list(graph.adj_list)
+        index = {v: i for i, v in enumerate(vertices)}
+        offsets = array("i", [0])
+        targets = array("i")
+        for vertex in vertices:
+            targets.extend(index[n] for n in graph.adj_list[vertex])
+            offsets.append(len(targets))
+        return cls(vertices, offsets, targets)
+
+    def __len__(self):
+        return len(self.vertices)
+
+    def neighbors(self, i):
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+    def degree(self, i):
+        return self.offsets[i + 1] - self.offsets[i]
+
+    def to_graph(self):
+        graph = Graph()
+        for i, vertex in enumerate(self.vertices):
+            graph.add_vertex(vertex)
+            graph.adj_list[vertex].extend(self.vertices[n] for n in self.neighbors(i))
+        return graph
     
 
 if __name__ == "__main__":
@@ -29,3 +78,5 @@ if __name__ == "__main__":
     graph.add_edge("A", "C")
     graph.add_edge("B", "D", is_directed = True)
     graph.display()
+    frozen = graph.freeze()
+    print("CSR offsets:", frozen.offsets.tolist(), "targets:", frozen.targets.tolist())
@@ -1,3 +1,4 @@
+from array import array
 from collections import deque
 
 def orangesRotting(grid):
@@ -28,6 +29,113 @@ def orangesRotting(grid):
 
     return minutes if fresh_oranges == 0 else -1
 
+
+EMPTY = -2   # no orange in this cell
+NEVER = -1   # fresh orange that never rots
+
+
+class RotTimeMap:
+    """
+    Per-cell rot times computed once with a multi-source BFS.
+
+    Times live in a flat array('i') (row-major, 4 bytes per cell), so point
+    queries are a single index. The BFS visit order is already sorted by
+    time, which makes "rotten by minute t" a prefix of that order.
+
+    Unlike orangesRotting, the input grid is left untouched.
+    """
+
+    def __init__(self, grid):
+        self.rows = len(grid)
+        self.cols = len(grid[0]) if self.rows else 0
+        rows, cols = self.rows, self.cols
+        times = array("i", [EMPTY]) * (rows * cols)
+        order = array("i")   # flat cell indices in rot-time order
+        fresh = 0
+
+        for r in range(rows):
+            for c in range(cols):
+                if grid[r][c] == 2:
+                    times[r * cols + c] = 0
+                    order.append(r * cols + c)
+                elif grid[r][c] == 1:
+                    times[r * cols + c] = NEVER
+                    fresh += 1
+
+        # order doubles as the BFS queue
+        head = 0
+        while head < len(order):
+            cell = order[head]
+            head += 1
+            r, c = divmod(cell, cols)
+            t = times[cell] + 1
+            for nr, nc in ((r, c + 1), (r + 1, c), (r, c - 1), (r - 1, c)):
+                if 0 <= nr < rows and 0 <= nc < cols and times[nr * cols + nc] == NEVER:
+                    times[nr * cols + nc] = t
+                    order.append(nr * cols + nc)
+                    fresh -= 1
+
+        self.times = times
+        self.order = order
+        self.fresh_left = fresh
+        self.max_minute = times[order[-1]] if order else 0
+
+        # counts[t] = oranges that turn rotten exactly at minute t,
+        # rotten_by[t] = how many are rotten at the end of minute t
+        counts = array("i", [0]) * (self.max_minute + 1)
+        for cell in order:
+            counts[times[cell]] += 1
+        rotten_by = array("i", counts)
+        for t in range(1, len(rotten_by)):
+            rotten_by[t] += rotten_by[t - 1]
+        self.counts = counts
+        self.rotten_by = rotten_by
+
+    def total_minutes(self):
+        """Same answer as orangesRotting: minutes to rot everything, or -1."""
+        return self.max_minute if self.fresh_left == 0 else -1
+
+    def _cell(self, r, c):
+        if not (0 <= r < self.rows and 0 <= c < self.cols):
+            raise IndexError(f"Cell {(r, c)} is outside the grid.")
+        return r * self.cols + c
+
+    def rot_time(self, r, c):
+        """Minute at which (r, c) rots, NEVER (-1) or EMPTY (-2). O(1)."""
+        return self.times[self._cell(r, c)]
+
+    def is_rotten_at(self, r, c, t):
+        """True if (r, c) is rotten at the end of minute t. O(1)."""
+        time = self.times[self._cell(r, c)]
+        return 0 <= time <= t
+
+    def count_rotten_by(self, t):
+        """Number of rotten oranges at the end of minute t. O(1)."""
+        if t < 0:
+            return 0
+        return self.rotten_by[min(t, self.max_minute)]
+
+    def count_fresh_at(self, t):
+        """Number of fresh oranges at the end of minute t. O(1)."""
+        return len(self.order) + self.fresh_left - self.count_rotten_by(t)
+
+    def rotten_cells(self, t):
+        """(r, c) of every orange rotten by minute t. O(k) for k results."""
+        k = self.count_rotten_by(t)
+        return [divmod(cell, self.cols) for cell in self.order[:k]]
+
+    def rotten_mask(self, t):
+        """Boolean grid: True where the cell is rotten at the end of minute t."""
+        mask = [[False] * self.cols for _ in range(self.rows)]
+        for r, c in self.rotten_cells(t):
+            mask[r][c] = True
+        return mask
+
+    def histogram(self):
+        """List where entry t is the number of oranges rotting at minute t."""
+        return self.counts.tolist()
+
+
 # Example usage
 if __name__ == "__main__":
     grid = [
@@ -35,4 +143,10 @@ if __name__ == "__main__":
         [1, 1, 0],
         [0, 1, 1]
     ]
-    print(orangesRotting(grid))  # Output: 4
\ No newline at end of file
+    rot_map = RotTimeMap(grid)
+    print(orangesRotting(grid))  # Output: 4
+    print("Total minutes from map:", rot_map.total_minutes())  # 4
+    print("Cell (2, 2) rots at minute:", rot_map.rot_time(2, 2))  # 4
+    print("Rotten after minute 2:", rot_map.count_rotten_by(2))  # 5
+    print("Fresh after minute 2:", rot_map.count_fresh_at(2))  # 2
+    print("Rot histogram:", rot_map.histogram())  # [1, 2, 2, 1, 1]
\ No newline at end of file
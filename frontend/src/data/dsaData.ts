@@ -102,7 +102,7 @@ const binaryTreesFiles: DsaFile[] = [
     {
       shortDescription: "Binary search tree operations in Python.",
       tags: ["Trees", "BST", PY],
-      concepts: ["Insert", "Search", "Traversal"],
+      concepts: ["Insert", "Search", "Traversal", "AVL rotations"],
       status: "in-progress",
       difficulty: "medium",
     },
@@ -122,16 +122,128 @@ const binaryTreesFiles: DsaFile[] = [
       difficulty: "medium",
     },
   ),
+  file(
+    "binary-trees",
+    "Binary Trees",
+    "bst_benchmark.py",
+    "bst-benchmark",
+    PY,
+    "code/binary-trees/bst_benchmark.py",
+    {
+      shortDescription: "Benchmarks BST against a bisect list and a dict across key streams.",
+      tags: ["Trees", "Benchmarking", PY],
+      concepts: ["Benchmarking", "tracemalloc", "Tree shape"],
+      status: "completed",
+      difficulty: "medium",
+    },
+  ),
+  file(
+    "binary-trees",
+    "Binary Trees",
+    "bst_pool.py",
+    "bst-pool",
+    PY,
+    "code/binary-trees/bst_pool.py",
+    {
+      shortDescription: "BST stored in parallel typed arrays instead of node objects.",
+      tags: ["Trees", "BST", "Memory", PY],
+      concepts: ["Node pool", "Free list", "AVL rotations"],
+      status: "completed",
+      difficulty: "hard",
+    },
+  ),
+  file(
+    "binary-trees",
+    "Binary Trees",
+    "btree.py",
+    "btree",
+    PY,
+    "code/binary-trees/btree.py",
+    {
+      shortDescription: "B+ tree ordered set: bisect-searched nodes and linked leaves.",
+      tags: ["Trees", "B+ tree", PY],
+      concepts: ["High fanout", "Node split / merge", "Range scan"],
+      status: "completed",
+      difficulty: "hard",
+    },
+  ),
+  file(
+    "binary-trees",
+    "Binary Trees",
+    "concurrent_bst.py",
+    "concurrent-bst",
+    PY,
+    "code/binary-trees/concurrent_bst.py",
+    {
+      shortDescription: "BST wrapper with parallel readers and serialized writers.",
+      tags: ["Trees", "Concurrency", PY],
+      concepts: ["Readers-writer lock", "Thread safety", "Stress testing"],
+      status: "completed",
+      difficulty: "medium",
+    },
+  ),
+  file(
+    "binary-trees",
+    "Binary Trees",
+    "interval_tree.py",
+    "interval-tree",
+    PY,
+    "code/binary-trees/interval_tree.py",
+    {
+      shortDescription: "BST of intervals augmented with subtree max end for overlap queries.",
+      tags: ["Trees", "Intervals", PY],
+      concepts: ["Augmented BST", "Interval overlap", "Subtree maximum"],
+      status: "completed",
+      difficulty: "hard",
+    },
+  ),
+  file(
+    "binary-trees",
+    "Binary Trees",
+    "lca_index.py",
+    "lca-index",
+    PY,
+    "code/binary-trees/lca_index.py",
+    {
+      shortDescription: "Constant-time LCA queries from an Euler tour and a sparse table.",
+      tags: ["Trees", "LCA", PY],
+      concepts: ["Euler tour", "Range minimum query", "Sparse table"],
+      status: "completed",
+      difficulty: "hard",
+    },
+  ),
+  file(
+    "binary-trees",
+    "Binary Trees",
+    "persistent_bst.py",
+    "persistent-bst",
+    PY,
+    "code/binary-trees/persistent_bst.py",
+    {
+      shortDescription: "Path-copying AVL tree whose versions are immutable snapshots.",
+      tags: ["Trees", "Persistence", PY],
+      concepts: ["Path copying", "Structural sharing", "Snapshots"],
+      status: "completed",
+      difficulty: "hard",
+    },
+  ),
 ];
 
 const graphsFiles: DsaFile[] = [
   file("graphs", "Graphs", "graph.py", "graph", PY, "code/graphs/graph.py", {
     shortDescription: "Graph representation (adjacency list / basics).",
     tags: ["Graphs", PY],
-    concepts: ["Adjacency list"],
+    concepts: ["Adjacency list", "CSR"],
     status: "completed",
     difficulty: "easy",
   }),
+  file("graphs", "Graphs", "graph_reordering.py", "graph-reordering", PY, "code/graphs/graph_reordering.py", {
+    shortDescription: "Renumber vertices (BFS, Reverse Cuthill-McKee, degree) to shrink bandwidth.",
+    tags: ["Graphs", "BFS", PY],
+    concepts: ["Bandwidth", "Memory locality"],
+    status: "completed",
+    difficulty: "hard",
+  }),
   file("graphs", "Graphs", "bfs_traversal.py", "bfs-traversal", PY, "code/graphs/bfs_traversal.py", {
     shortDescription: "Breadth-first traversal from a source node.",
     tags: ["Graphs", "BFS", PY],
@@ -139,6 +251,13 @@ const graphsFiles: DsaFile[] = [
     status: "completed",
     difficulty: "medium",
   }),
+  file("graphs", "Graphs", "reachability_index.py", "reachability-index", PY, "code/graphs/reachability_index.py", {
+    shortDescription: "Answer repeated u -> v reachability queries from a prebuilt index.",
+    tags: ["Graphs", "SCC", PY],
+    concepts: ["Tarjan SCC", "Transitive closure", "Interval labels"],
+    status: "completed",
+    difficulty: "hard",
+  }),
   file("graphs", "Graphs", "dfs_traversal.py", "dfs-traversal", PY, "code/graphs/dfs_traversal.py", {
     shortDescription: "Depth-first traversal (recursive / iterative).",
     tags: ["Graphs", "DFS", PY],
@@ -156,10 +275,24 @@ const graphsFiles: DsaFile[] = [
   file("graphs", "Graphs", "rotten_oranges.py", "rotten-oranges", PY, "code/graphs/rotten_oranges.py", {
     shortDescription: "Multi-source BFS on a grid (time to rot all oranges).",
     tags: ["Graphs", "BFS", "Grid", PY],
-    concepts: ["Multi-source BFS"],
+    concepts: ["Multi-source BFS", "Precomputed queries"],
     status: "reviewing",
     difficulty: "medium",
   }),
+  file("graphs", "Graphs", "grid_labeling.py", "grid-labeling", PY, "code/graphs/grid_labeling.py", {
+    shortDescription: "Count grid regions and their sizes with two-pass union-find labeling.",
+    tags: ["Graphs", "Union-find", "Grid", PY],
+    concepts: ["Connected components", "Run-length rows"],
+    status: "completed",
+    difficulty: "hard",
+  }),
+  file("graphs", "Graphs", "grid_pathfinding.py", "grid-pathfinding", PY, "code/graphs/grid_pathfinding.py", {
+    shortDescription: "Point-to-point grid routes with A* and jump point search.",
+    tags: ["Graphs", "A*", "Grid", PY],
+    concepts: ["Heuristic search", "Jump points"],
+    status: "completed",
+    difficulty: "hard",
+  }),
 ];
 
 const recursionFiles: DsaFile[] = [1, 2, 3, 4, 5, 6, 7, 8].map((n) =>